@@ -6,14 +6,187 @@ including browser automation with Playwright for capturing slide screenshots.
 """
 
 import asyncio
+import hashlib
+import io
+import json
 import logging
 import os
-from typing import List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
-from playwright.async_api import async_playwright, Browser, Page, ViewportSize
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright, ViewportSize
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+import aiohttp
 
 logger = logging.getLogger(__name__)
 
+# Worker threads for CPU-bound image encoding. Pillow releases the GIL inside
+# its encoders, so threads overlap with each other and with browser I/O.
+_IMAGE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="image-encode"
+)
+
+
+class _BrowserSingleton:
+    """
+    Process-wide Chromium instance shared by all converters.
+
+    When ``CHROMIUM_CDP_URL`` is set, connects to an existing Chromium started
+    with ``--remote-debugging-port`` so that every worker process shares one
+    browser; otherwise a local headless Chromium is launched.
+    """
+
+    # Headless flags trimming background services, GPU and throttling
+    LAUNCH_ARGS = [
+        '--disable-web-security',
+        '--disable-features=IsolateOrigins,site-per-process,TranslateUI',
+        '--disable-gpu',
+        '--no-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-background-networking',
+        '--disable-default-apps',
+        '--disable-extensions',
+        '--disable-sync',
+        '--metrics-recording-only',
+        '--mute-audio',
+        '--no-first-run',
+        '--hide-scrollbars',
+        '--disable-renderer-backgrounding',
+        '--disable-background-timer-throttling',
+        '--disable-backgrounding-occluded-windows',
+        '--font-render-hinting=none',
+    ]
+
+    # Contexts opened on a launched browser before it is replaced, to bound memory
+    MAX_USES = int(os.getenv("BROWSER_MAX_USES", "50"))
+
+    _playwright: Optional[Playwright] = None
+    _browser: Optional[Browser] = None
+    _lock = asyncio.Lock()
+    _slots = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_CONVERSIONS", "8")))
+    _uses = 0
+    _active = 0
+
+    @classmethod
+    async def _start_driver(cls) -> Playwright:
+        """Start the Playwright driver if needed; the caller holds _lock."""
+        if cls._playwright is None:
+            cls._playwright = await async_playwright().start()
+        return cls._playwright
+
+    @classmethod
+    async def driver(cls) -> Playwright:
+        """Return the shared Playwright driver without launching a browser."""
+        async with cls._lock:
+            return await cls._start_driver()
+
+    @classmethod
+    async def get(cls) -> Browser:
+        """Return the shared browser, launching it on first use."""
+        async with cls._lock:
+            if cls._browser is None or not cls._browser.is_connected():
+                await cls._start_driver()
+
+                cdp_url = os.getenv("CHROMIUM_CDP_URL")
+                if cdp_url:
+                    # Attach to a long-running Chromium shared by all workers
+                    logger.info(f"Connecting to Chromium over CDP: {cdp_url}")
+                    cls._browser = await cls._playwright.chromium.connect_over_cdp(cdp_url)
+                else:
+                    # Launch browser in headless mode
+                    logger.info("Launching shared Playwright browser...")
+                    cls._browser = await cls._playwright.chromium.launch(
+                        headless=True,
+                        args=cls.LAUNCH_ARGS
+                    )
+                cls._uses = 0
+                logger.info("Shared browser ready")
+
+            return cls._browser
+
+    @classmethod
+    async def acquire(cls) -> Browser:
+        """
+        Reserve a conversion slot on the shared browser.
+
+        Waits while MAX_CONCURRENT_CONVERSIONS conversions are running. A
+        launched browser that has served MAX_USES conversions is replaced
+        once it is idle. Every call must be paired with release().
+
+        Returns:
+            The shared browser
+        """
+        await cls._slots.acquire()
+        try:
+            async with cls._lock:
+                recycle = (
+                    cls._browser is not None
+                    and cls._uses >= cls.MAX_USES
+                    and cls._active == 0
+                    and not os.getenv("CHROMIUM_CDP_URL")
+                )
+                if recycle:
+                    logger.info(f"Recycling shared browser after {cls._uses} uses")
+                    await cls._browser.close()
+                    cls._browser = None
+
+            browser = await cls.get()
+        except BaseException:
+            # Also on cancellation, or the slot would be lost for good
+            cls._slots.release()
+            raise
+
+        cls._uses += 1
+        cls._active += 1
+        return browser
+
+    @classmethod
+    def release(cls) -> None:
+        """Free a slot reserved by acquire()."""
+        cls._active -= 1
+        cls._slots.release()
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Close (or disconnect from) the shared browser and stop Playwright."""
+        async with cls._lock:
+            if cls._browser is not None:
+                logger.info("Closing shared browser...")
+                await cls._browser.close()
+                cls._browser = None
+            if cls._playwright is not None:
+                await cls._playwright.stop()
+                cls._playwright = None
+
+
+class _PagePool:
+    """Pages loaded on one presentation, with a queue of those not in use."""
+
+    def __init__(self):
+        self.pages: List[Page] = []
+        self.free: asyncio.Queue = asyncio.Queue()
+
+
+async def chromium_executable() -> Optional[Path]:
+    """
+    Locate Playwright's Chromium without launching it.
+
+    Returns:
+        Path to the executable, or None if it is not installed
+    """
+    driver = await _BrowserSingleton.driver()
+    executable = Path(driver.chromium.executable_path)
+    return executable if executable.exists() else None
+
+
+async def shutdown() -> None:
+    """Release the shared browser; call once when the application stops."""
+    BaseConverter._POOL.clear()
+    await _BrowserSingleton.shutdown()
+
 
 class BaseConverter:
     """Base class for presentation converters with shared screenshot capture."""
@@ -22,6 +195,57 @@ class BaseConverter:
     SLIDE_WIDTH = 1920
     SLIDE_HEIGHT = 1080
 
+    # CSS hiding viewer UI (edit controls, Reveal chrome) during capture
+    CLEAN_CSS = """
+        #help-text,
+        #toggle-edit-mode,
+        #edit-controls,
+        #edit-notification,
+        .edit-shortcuts,
+        #toggle-review-mode,
+        #selection-indicator,
+        #regeneration-panel,
+        .reveal .controls,
+        .reveal .progress,
+        .reveal .slide-number,
+        .grid-overlay {
+            display: none !important;
+            visibility: hidden !important;
+            opacity: 0 !important;
+        }
+
+        /* Ensure background is white */
+        body, .reveal {
+            background-color: white !important;
+        }
+    """
+
+    # Device pixel ratio for captures (2x keeps full-slide PDF output sharp)
+    DEVICE_SCALE_FACTOR = 2.0
+
+    # JPEG quality for captures that do not need lossless output
+    JPEG_QUALITY = 85
+
+    # Number of pages opened on the presentation for parallel slide capture
+    PAGE_POOL_SIZE = int(os.getenv("PAGE_POOL_SIZE", "4"))
+
+    # Idle contexts (with a blank page) shared across converters, keyed by
+    # device scale factor; filled by warm_pool()
+    _POOL: Dict[float, List[Tuple[BrowserContext, Page]]] = {}
+    _POOL_TARGET: Dict[float, int] = {}
+    _refill_tasks: Dict[float, asyncio.Task] = {}
+
+    # HTTP session shared by all converters so API calls reuse connections
+    _http: Optional[aiohttp.ClientSession] = None
+
+    # Seconds allowed for the presentation version check before a conversion
+    VERSION_TIMEOUT = 2.0
+
+    # Last ETag seen per presentation API URL, sent back as If-None-Match so
+    # an unchanged presentation costs a bodyless 304 (oldest dropped first)
+    _etags: "OrderedDict[str, str]" = OrderedDict()
+    MAX_KNOWN_ETAGS = 1024
+
     def __init__(self, base_url: str = None):
         """
         Initialize the base converter.
@@ -35,127 +259,440 @@ class BaseConverter:
             base_url = f"http://localhost:{port}"
         self.base_url = base_url
         self._browser: Optional[Browser] = None
+        self._context: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
+        self._page_pool: Optional[_PagePool] = None
+        self._pool_lock = asyncio.Lock()
+        self._context_users = 0
+        # Presentation JSON fetched by the version check, reused by converters
+        self._presentation_bodies: Dict[str, bytes] = {}
+
+    @classmethod
+    async def warm_pool(cls, pool_size: int = 4) -> Browser:
+        """
+        Launch the shared browser and pre-create idle contexts.
 
-    async def _init_browser(self) -> None:
-        """Initialize Playwright browser and page."""
-        if self._browser is not None:
-            return
+        Converters take a warm context (with a blank page) instead of creating
+        one, so the first requests skip browser launch and context setup. Taken
+        contexts are replaced in the background.
 
-        logger.info("Initializing Playwright browser...")
-        playwright = await async_playwright().start()
+        Args:
+            pool_size: Number of idle contexts to keep for this converter's
+                       device scale factor
 
-        # Launch browser in headless mode
-        self._browser = await playwright.chromium.launch(
-            headless=True,
-            args=['--disable-web-security', '--disable-features=IsolateOrigins,site-per-process']
-        )
+        Returns:
+            The shared browser
+        """
+        browser = await _BrowserSingleton.get()
+        dpr = cls.DEVICE_SCALE_FACTOR
+        BaseConverter._POOL_TARGET[dpr] = pool_size
 
+        pool = BaseConverter._POOL.setdefault(dpr, [])
+        while len(pool) < pool_size:
+            pool.append(await cls._new_context(browser, dpr))
+
+        logger.info(f"Browser pool warmed ({len(pool)} contexts at {dpr}x)")
+        return browser
+
+    @classmethod
+    async def _new_context(cls, browser: Browser, device_scale_factor: float) -> Tuple[BrowserContext, Page]:
+        """Create a capture context with the clean CSS and one blank page."""
         # Create browser context with presentation viewport
-        context = await self._browser.new_context(
+        context = await browser.new_context(
             viewport=ViewportSize(
-                width=self.SLIDE_WIDTH,
-                height=self.SLIDE_HEIGHT
+                width=cls.SLIDE_WIDTH,
+                height=cls.SLIDE_HEIGHT
             ),
-            device_scale_factor=2  # High DPI for better quality
+            device_scale_factor=device_scale_factor
         )
+        try:
+            await cls._inject_clean_css(context)
+            page = await context.new_page()
+        except BaseException:
+            # Do not leak a half-built context (e.g. when cancelled)
+            await context.close()
+            raise
+        return context, page
+
+    @classmethod
+    def _take_warm_context(cls, browser: Browser, device_scale_factor: float) -> Optional[Tuple[BrowserContext, Page]]:
+        """Pop an idle context on ``browser`` and schedule its replacement."""
+        pool = BaseConverter._POOL.get(device_scale_factor, [])
+        warm = None
+        while pool and warm is None:
+            context, page = pool.pop()
+            # Skip contexts left over from a browser that has since been replaced
+            if context.browser is browser:
+                warm = context, page
+
+        if BaseConverter._POOL_TARGET.get(device_scale_factor):
+            refill = BaseConverter._refill_tasks.get(device_scale_factor)
+            if refill is None or refill.done():
+                BaseConverter._refill_tasks[device_scale_factor] = asyncio.create_task(
+                    cls._refill_pool(browser, device_scale_factor)
+                )
+        return warm
 
-        self._page = await context.new_page()
-        logger.info("Browser initialized successfully")
+    @classmethod
+    async def _refill_pool(cls, browser: Browser, device_scale_factor: float) -> None:
+        """Top the idle pool back up to its target size."""
+        pool = BaseConverter._POOL.setdefault(device_scale_factor, [])
+        try:
+            while len(pool) < BaseConverter._POOL_TARGET.get(device_scale_factor, 0) and browser.is_connected():
+                pool.append(await cls._new_context(browser, device_scale_factor))
+        except Exception as e:
+            logger.warning(f"Failed to refill browser pool: {e}")
+
+    @classmethod
+    async def _get_http(cls) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        if BaseConverter._http is None or BaseConverter._http.closed:
+            BaseConverter._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=32,
+                    keepalive_timeout=60,
+                    enable_cleanup_closed=True
+                )
+            )
+        return BaseConverter._http
+
+    @classmethod
+    async def close_http(cls) -> None:
+        """Close the shared HTTP session; call once when the application stops."""
+        if BaseConverter._http is not None:
+            await BaseConverter._http.close()
+            BaseConverter._http = None
+
+    async def _presentation_version(self, presentation_id: str) -> Optional[str]:
+        """
+        Identify the current content of a presentation.
+
+        Uses the presentation API's ETag, or a hash of the JSON body when the
+        API sends none, so cached conversions are tied to the content they
+        were rendered from. A known ETag is revalidated with If-None-Match;
+        a fetched body is kept in _presentation_bodies for reuse.
+
+        Args:
+            presentation_id: The UUID of the presentation
+
+        Returns:
+            Version string, or None if the API could not be reached
+        """
+        api_url = f"{self.base_url}/api/presentations/{presentation_id}"
+        known_etag = BaseConverter._etags.get(api_url)
+        headers = {'If-None-Match': known_etag} if known_etag else {}
+        try:
+            session = await self._get_http()
+            async with session.get(
+                api_url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=self.VERSION_TIMEOUT)
+            ) as resp:
+                if resp.status == 304 and known_etag:
+                    return known_etag
+                if resp.status != 200:
+                    return None
+                body = await resp.read()
+                etag = resp.headers.get('ETag')
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Could not fetch presentation version: {e}")
+            return None
+
+        self._presentation_bodies[presentation_id] = body
+        if not etag:
+            return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+        BaseConverter._etags[api_url] = etag
+        BaseConverter._etags.move_to_end(api_url)
+        while len(BaseConverter._etags) > self.MAX_KNOWN_ETAGS:
+            BaseConverter._etags.popitem(last=False)
+        return etag
+
+    async def _init_browser(self, device_scale_factor: Optional[float] = None) -> None:
+        """
+        Open an isolated context and page on the shared browser.
 
-    async def _close_browser(self) -> None:
-        """Close Playwright browser and cleanup."""
-        if self._browser:
-            logger.info("Closing browser...")
-            await self._browser.close()
+        Uses a warm context from the pool when one is available. Holds a
+        conversion slot on the shared browser until _close_context().
+
+        Args:
+            device_scale_factor: Device pixel ratio for the context
+                                 (defaults to DEVICE_SCALE_FACTOR)
+        """
+        if self._context is not None:
+            return
+
+        dpr = device_scale_factor or self.DEVICE_SCALE_FACTOR
+        browser = await _BrowserSingleton.acquire()
+
+        try:
+            warm = self._take_warm_context(browser, dpr)
+            if warm:
+                self._context, self._page = warm
+                logger.info("Using warm browser context")
+            else:
+                self._context, self._page = await self._new_context(browser, dpr)
+                logger.info("Browser context initialized successfully")
+        except BaseException:
+            _BrowserSingleton.release()
+            raise
+
+        self._browser = browser
+
+    async def _close_context(self) -> None:
+        """Close this converter's browser context; the shared browser stays up."""
+        if self._context:
+            logger.info("Closing browser context...")
+            try:
+                await self._context.close()
+            finally:
+                _BrowserSingleton.release()
             self._browser = None
+            self._context = None
             self._page = None
+            self._page_pool = None
 
-    async def capture_slide_screenshots(
-        self,
-        presentation_id: str,
-        slide_count: Optional[int] = None
-    ) -> List[bytes]:
+    @asynccontextmanager
+    async def with_context(self) -> AsyncIterator[None]:
         """
-        Capture screenshots of all slides in a presentation.
+        Keep this converter's browser context open for the duration of the block.
+
+        Captures inside the block share one context, with its loaded pages and
+        HTTP cache, instead of each opening and closing their own. Blocks may
+        nest; the context is closed when the outermost one exits.
+        """
+        self._context_users += 1
+        try:
+            yield
+        finally:
+            self._context_users -= 1
+            if self._context_users == 0:
+                await self._close_context()
+
+    async def _open_page_pool(self, presentation_id: str, size: int = 1) -> List[Page]:
+        """
+        Load the presentation into a pool of pages for parallel capture.
+
+        Further pages are opened on the same context until the pool holds
+        ``size`` pages. The pool lives as long as the context, so repeated
+        captures within one conversion skip navigation and Reveal start-up.
+        A converter captures a single presentation per context.
 
         Args:
             presentation_id: The UUID of the presentation
-            slide_count: Number of slides in the presentation
+            size: Minimum number of pages in the pool
 
         Returns:
-            List of screenshot bytes (PNG format) for each slide
+            List of pages loaded on the presentation
 
         Raises:
             ValueError: If presentation cannot be loaded
-            RuntimeError: If screenshot capture fails
         """
-        await self._init_browser()
-
-        screenshots = []
         url = f"{self.base_url}/p/{presentation_id}"
 
+        async with self._pool_lock:
+            await self._init_browser()
+
+            if self._page_pool is None:
+                self._page_pool = _PagePool()
+            pool = self._page_pool
+
+            # The context's initial blank page is the pool's first page
+            new_pages: List[Page] = []
+            if self._page is not None and not pool.pages and size > 0:
+                new_pages.append(self._page)
+            while len(pool.pages) + len(new_pages) < size:
+                new_pages.append(await self._context.new_page())
+
+            # Load the pages concurrently; each tab has its own renderer
+            results = await asyncio.gather(
+                *(self._load_presentation(page, url) for page in new_pages),
+                return_exceptions=True
+            )
+            failures = []
+            for page, result in zip(new_pages, results):
+                if isinstance(result, BaseException):
+                    # Capture goes on with the pages that did load
+                    failures.append(result)
+                    if page is self._page:
+                        self._page = None
+                    await page.close()
+                else:
+                    pool.pages.append(page)
+                    pool.free.put_nowait(page)
+
+            if failures:
+                if not pool.pages:
+                    raise failures[0]
+                logger.warning(f"{len(failures)} of {len(new_pages)} pages failed to load: {failures[0]}")
+
+            if len(pool.pages) > 1:
+                logger.info(f"Page pool ready ({len(pool.pages)} pages)")
+            return pool.pages
+
+    async def _load_presentation(self, page: Page, url: str) -> None:
+        """Navigate a page to the presentation and prepare it for capture."""
+        logger.info(f"Navigating to presentation: {url}")
+        # Reveal readiness and the per-slide font/image checks are the real
+        # signals; networkidle can be held open by polling and pings
+        response = await page.goto(url, wait_until='domcontentloaded', timeout=15000)
+
+        if not response or response.status != 200:
+            raise ValueError(f"Failed to load presentation: {url}")
+
+        await self._wait_for_reveal_ready(page=page)
+        await self._configure_reveal(page)
+        await self._install_slide_hook(page)
+
+    @asynccontextmanager
+    async def _checkout_page(self) -> AsyncIterator[Page]:
+        """Borrow a page of the page pool for the duration of the block."""
+        pool = self._page_pool
+        page = await pool.free.get()
         try:
-            logger.info(f"Navigating to presentation: {url}")
+            yield page
+        finally:
+            pool.free.put_nowait(page)
 
-            # Navigate to presentation viewer
-            response = await self._page.goto(url, wait_until='networkidle')
+    async def _run_image_task(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a CPU-bound image or document encoding function off the event loop.
+
+        Args:
+            fn: Function to call
+            *args: Positional arguments for ``fn``
 
-            if not response or response.status != 200:
-                raise ValueError(f"Failed to load presentation: {presentation_id}")
+        Returns:
+            The function's return value
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_IMAGE_EXECUTOR, fn, *args)
 
-            # Wait for Reveal.js to initialize
-            # Configure Reveal.js
-            await self._configure_reveal()
+    async def _save_document(self, document: Any, output_path: Optional[Path] = None) -> bytes:
+        """
+        Serialize a document (anything with ``save(target)``) off the event loop.
 
-            # Inject CSS to hide UI elements
-            await self._inject_clean_css()
+        With an ``output_path`` the document is written straight to disk, rather
+        than through an in-memory copy, and read back; otherwise it is saved
+        to a buffer.
 
-            # If slide_count is missing, fetch it from Reveal.js
-            if slide_count is None:
-                logger.info("Slide count not provided, detecting from presentation...")
-                slide_count = await self._page.evaluate("Reveal.getTotalSlides()")
-                logger.info(f"Detected {slide_count} slides")
+        Args:
+            document: Document to save, e.g. a python-pptx Presentation
+            output_path: Optional file path to save the document to
 
-            # Capture each slide
-            for slide_index in range(slide_count):
-                logger.info(f"Capturing slide {slide_index + 1}/{slide_count}")
+        Returns:
+            The saved document as bytes
+        """
+        if output_path:
+            await self._run_image_task(document.save, str(output_path))
+            return await self._run_image_task(output_path.read_bytes)
 
-                # Navigate to specific slide using Reveal.js API
-                await self._page.evaluate(f"Reveal.slide({slide_index}, 0)")
+        buffer = io.BytesIO()
+        await self._run_image_task(document.save, buffer)
+        return buffer.getvalue()
 
-                # Wait for slide transition to complete
-                await asyncio.sleep(0.5)
+    def _screenshot_options(self, screenshot_format: str) -> dict:
+        """
+        Build Playwright screenshot options for an image format.
 
-                # Wait for any images or content to load
-                await self._page.wait_for_load_state('networkidle', timeout=5000)
+        Args:
+            screenshot_format: 'jpeg' or 'png'
 
-                # Capture screenshot of the full viewport
-                # We use full_page=False to capture exactly the viewport size (1920x1080)
-                screenshot = await self._page.screenshot(
-                    type='png',
-                    full_page=False,
-                    scale='device'  # Use device scale factor (2x for high DPI)
-                )
+        Returns:
+            Keyword arguments for ``screenshot()``
+        """
+        if screenshot_format == 'jpeg':
+            return {'type': 'jpeg', 'quality': self.JPEG_QUALITY}
+        return {'type': 'png'}
 
-                screenshots.append(screenshot)
-                logger.info(f"Slide {slide_index + 1} captured ({len(screenshot)} bytes)")
+    async def _capture_one(self, page: Page, slide_index: int, screenshot_format: str = 'jpeg') -> bytes:
+        """
+        Capture a single slide on the given pooled page.
 
-            logger.info(f"Successfully captured {len(screenshots)} slides")
-            return screenshots
+        Args:
+            page: Page loaded on the presentation
+            slide_index: The index of the slide (0-based)
+            screenshot_format: 'jpeg' or 'png'
 
-        except Exception as e:
-            logger.error(f"Error capturing screenshots: {e}", exc_info=True)
-            raise RuntimeError(f"Screenshot capture failed: {e}") from e
+        Returns:
+            Screenshot bytes in the requested format
+        """
+        # Navigate to specific slide using Reveal.js API
+        await self._goto_slide(page, slide_index)
+
+        # Capture screenshot of the full viewport
+        # We use full_page=False to capture exactly the viewport size (1920x1080)
+        return await page.screenshot(
+            **self._screenshot_options(screenshot_format),
+            full_page=False,
+            scale='device'  # Use device scale factor (DEVICE_SCALE_FACTOR)
+        )
 
-        finally:
-            await self._close_browser()
+    async def capture_slide_screenshots(
+        self,
+        presentation_id: str,
+        slide_count: Optional[int] = None,
+        screenshot_format: str = 'jpeg'
+    ) -> List[bytes]:
+        """
+        Capture screenshots of all slides in a presentation.
+
+        Args:
+            presentation_id: The UUID of the presentation
+            slide_count: Number of slides in the presentation
+            screenshot_format: 'jpeg' (default, smaller and faster to encode)
+                               or 'png' for lossless output
+
+        Returns:
+            List of screenshot bytes for each slide, in order
+
+        Raises:
+            ValueError: If presentation cannot be loaded
+            RuntimeError: If screenshot capture fails
+        """
+        async with self.with_context():
+            try:
+                # Load the presentation on the primary page
+                pages = await self._open_page_pool(presentation_id)
+
+                # If slide_count is missing, fetch it from Reveal.js
+                if slide_count is None:
+                    logger.info("Slide count not provided, detecting from presentation...")
+                    slide_count = await pages[0].evaluate("Reveal.getTotalSlides()")
+                    logger.info(f"Detected {slide_count} slides")
+
+                # Capture slides in parallel across a pool of pages; each page
+                # is checked out exclusively so Reveal.slide() calls never race
+                await self._open_page_pool(presentation_id, min(self.PAGE_POOL_SIZE, slide_count))
+
+                screenshots: List[Optional[bytes]] = [None] * slide_count
+
+                async def capture(slide_index: int) -> None:
+                    async with self._checkout_page() as page:
+                        logger.info(f"Capturing slide {slide_index + 1}/{slide_count}")
+                        screenshot = await self._capture_one(page, slide_index, screenshot_format)
+                        screenshots[slide_index] = screenshot
+                        logger.info(f"Slide {slide_index + 1} captured ({len(screenshot)} bytes)")
+
+                await asyncio.gather(*(capture(i) for i in range(slide_count)))
+
+                missing = [i + 1 for i, shot in enumerate(screenshots) if shot is None]
+                if missing:
+                    raise RuntimeError(f"Slides not captured: {missing}")
+
+                logger.info(f"Successfully captured {len(screenshots)} slides")
+                return screenshots
+
+            except Exception as e:
+                logger.error(f"Error capturing screenshots: {e}", exc_info=True)
+                raise RuntimeError(f"Screenshot capture failed: {e}") from e
 
     async def capture_element_screenshot(
         self,
         presentation_id: str,
         slide_index: int,
-        selector: str
+        selector: str,
+        screenshot_format: str = 'png'
     ) -> Optional[bytes]:
         """
         Capture screenshot of a specific element on a slide.
@@ -164,52 +701,73 @@ class BaseConverter:
             presentation_id: The UUID of the presentation
             slide_index: The index of the slide (0-based)
             selector: CSS selector for the element to capture
+            screenshot_format: 'png' (default, sharp text) or 'jpeg'
             
         Returns:
             Screenshot bytes or None if element not found
         """
-        await self._init_browser()
-        
-        url = f"{self.base_url}/p/{presentation_id}"
-        
-        try:
-            # Navigate if not already on the page
-            if not self._page.url.startswith(url):
-                logger.info(f"Navigating to {url}")
-                response = await self._page.goto(url, wait_until='networkidle')
-                if not response or response.status != 200:
-                    raise ValueError(f"Failed to load presentation: {presentation_id}")
-                
-                await self._wait_for_reveal_ready()
-                await self._configure_reveal()
-                await self._inject_clean_css()
-
-            # Go to slide
-            await self._page.evaluate(f"Reveal.slide({slide_index}, 0)")
-            await asyncio.sleep(0.5) # Wait for render
-            
-            # Wait for element
-            try:
-                element = await self._page.wait_for_selector(selector, timeout=5000)
-                if element:
-                    # Check if element is visible
-                    is_visible = await element.is_visible()
-                    if is_visible:
-                        return await element.screenshot(type='png')
-                    else:
-                        logger.warning(f"Element {selector} is not visible on slide {slide_index}")
-            except Exception:
-                logger.warning(f"Element {selector} not found on slide {slide_index}")
-                
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error capturing element {selector}: {e}")
-            return None
+        captures = await self.capture_elements(presentation_id, slide_index, [selector], screenshot_format)
+        return captures.get(selector)
 
-    async def _configure_reveal(self):
+    async def capture_elements(
+        self,
+        presentation_id: str,
+        slide_index: int,
+        selectors: List[str],
+        screenshot_format: str = 'png'
+    ) -> Dict[str, bytes]:
+        """
+        Capture screenshots of several elements on a slide in one visit.
+
+        The slide is shown once and every selector is captured from the same
+        page state.
+
+        Args:
+            presentation_id: The UUID of the presentation
+            slide_index: The index of the slide (0-based)
+            selectors: CSS selectors for the elements to capture
+            screenshot_format: 'png' (default, sharp text) or 'jpeg'
+
+        Returns:
+            Mapping of selector to screenshot bytes; elements that are missing
+            or hidden are omitted
+        """
+        captures: Dict[str, bytes] = {}
+
+        # Outside a caller's with_context() block this opens and closes the
+        # context (and frees its conversion slot) around the capture
+        async with self.with_context():
+            try:
+                await self._open_page_pool(presentation_id)
+
+                async with self._checkout_page() as page:
+                    # Go to slide
+                    await self._goto_slide(page, slide_index)
+
+                    for selector in selectors:
+                        # Playwright waits for the element to be visible and clips
+                        # to its box; animations are frozen and the caret hidden
+                        try:
+                            element = page.locator(selector).first
+                            await element.scroll_into_view_if_needed(timeout=3000)
+                            captures[selector] = await element.screenshot(
+                                **self._screenshot_options(screenshot_format),
+                                animations='disabled',
+                                caret='hide',
+                                timeout=3000
+                            )
+                        except Exception:
+                            logger.warning(f"Element {selector} not found or not visible on slide {slide_index}")
+
+            except Exception as e:
+                logger.error(f"Error capturing elements on slide {slide_index}: {e}")
+
+        return captures
+
+    async def _configure_reveal(self, page: Optional[Page] = None):
         """Configure Reveal.js for clean capture (no centering, no transitions)."""
-        await self._page.evaluate("""
+        page = page or self._page
+        await page.evaluate("""
             if (typeof Reveal !== 'undefined') {
                 Reveal.configure({ 
                     center: false, 
@@ -221,41 +779,84 @@ class BaseConverter:
         """)
         logger.info("Configured Reveal.js (center: false, transition: none)")
 
-    async def _inject_clean_css(self):
-        """Inject CSS to hide UI elements."""
-        await self._page.add_style_tag(content="""
-            #help-text,
-            #toggle-edit-mode,
-            #edit-controls,
-            #edit-notification,
-            .edit-shortcuts,
-            #toggle-review-mode,
-            #selection-indicator,
-            #regeneration-panel,
-            .reveal .controls,
-            .reveal .progress,
-            .reveal .slide-number,
-            .grid-overlay {
-                display: none !important;
-                visibility: hidden !important;
-                opacity: 0 !important;
-            }
-            
-            /* Ensure background is white */
-            body, .reveal {
-                background-color: white !important;
+    @classmethod
+    async def _inject_clean_css(cls, context: BrowserContext, css: Optional[str] = None) -> None:
+        """
+        Register CSS hiding UI elements on every page of a context.
+
+        The stylesheet is added by an init script, so it is present from the
+        first paint of each navigation instead of being patched in afterwards.
+
+        Args:
+            context: Context to register the stylesheet on
+            css: Stylesheet to use (defaults to CLEAN_CSS)
+        """
+        await context.add_init_script(script=f"""
+            (() => {{
+                const style = document.createElement('style');
+                style.textContent = {json.dumps(css or cls.CLEAN_CSS)};
+                const attach = () => (document.head || document.documentElement).appendChild(style);
+                if (document.documentElement) {{
+                    attach();
+                }} else {{
+                    document.addEventListener('DOMContentLoaded', attach, {{ once: true }});
+                }}
+            }})();
+        """)
+        logger.info("Registered CSS to hide UI elements")
+
+    async def _install_slide_hook(self, page: Page) -> None:
+        """Install a ``slidechanged`` listener that flags when a slide is shown."""
+        await page.evaluate("""
+            if (!window.__slideHook) {
+                window.__slideHook = true;
+                window.__slideReady = false;
+                Reveal.on('slidechanged', () => { window.__slideReady = true; });
             }
         """)
-        logger.info("Injected CSS to hide UI elements")
 
-    async def _wait_for_reveal_ready(self, timeout: int = 10000) -> None:
+    async def _goto_slide(self, page: Page, slide_index: int, timeout: int = 3000) -> None:
+        """
+        Show a slide and wait until it is ready to capture.
+
+        Readiness is signalled by Reveal's ``slidechanged`` event (or the slide
+        already being current), loaded web fonts and completed slide images,
+        instead of sleeping for a fixed transition time. If the slide is not
+        ready within ``timeout`` it is captured as shown.
+
+        Args:
+            page: Page loaded on the presentation with the slide hook installed
+            slide_index: The index of the slide (0-based)
+            timeout: Maximum time to wait in milliseconds
+        """
+        # Reveal.slide() clamps to the last horizontal slide, so compare
+        # against the clamped index or slidechanged may never be awaited
+        await page.evaluate(f"""{{
+            const target = Math.min({slide_index}, Reveal.getHorizontalSlides().length - 1);
+            window.__slideReady = Reveal.getIndices().h === target;
+            Reveal.slide(target, 0);
+        }}""")
+        try:
+            await page.wait_for_function("""
+                window.__slideReady
+                    && document.fonts.status === 'loaded'
+                    && Array.from(Reveal.getCurrentSlide().querySelectorAll('img'))
+                           .every(img => img.complete)
+            """, timeout=timeout)
+        except PlaywrightTimeoutError:
+            # Capture what is shown rather than failing the whole conversion
+            logger.warning(f"Slide {slide_index + 1} not fully loaded after {timeout}ms, capturing anyway")
+
+    async def _wait_for_reveal_ready(self, timeout: int = 10000, page: Optional[Page] = None) -> None:
         """
         Wait for Reveal.js to be fully initialized and ready.
 
         Args:
             timeout: Maximum time to wait in milliseconds
+            page: Page to wait on (defaults to the primary page)
         """
-        await self._page.wait_for_function(
+        page = page or self._page
+        await page.wait_for_function(
             "typeof Reveal !== 'undefined' && Reveal.isReady()",
             timeout=timeout
         )
@@ -0,0 +1,183 @@
+"""
+Cache for finished conversions.
+
+Concurrent requests for the same conversion are coalesced: callers arriving
+while one is running wait for its result instead of repeating the browser
+work. Results are kept in memory for CONVERSION_CACHE_TTL seconds and, when
+CONVERSION_CACHE_DIR is set, on disk keyed by the presentation's content
+version so they survive restarts.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds a finished conversion is served from memory (0 disables, keeping
+# only the coalescing of concurrent requests)
+CACHE_TTL = float(os.getenv("CONVERSION_CACHE_TTL", "300"))
+
+# Finished conversions kept at most, by count and by total size (least
+# recently used dropped first); 2x screenshot decks run to tens of MB each
+CACHE_SIZE = 128
+CACHE_MAX_BYTES = int(os.getenv("CONVERSION_CACHE_MAX_BYTES", str(256 << 20)))
+
+# Directory for the on-disk tier (unset disables it) and files kept there
+CACHE_DIR = os.getenv("CONVERSION_CACHE_DIR")
+CACHE_DIR_MAX_FILES = int(os.getenv("CONVERSION_CACHE_DIR_MAX_FILES", "256"))
+
+_results: "OrderedDict[Tuple, Tuple[float, bytes]]" = OrderedDict()
+_inflight: Dict[Tuple, asyncio.Future] = {}
+_results_bytes = 0
+
+
+def _drop(key: Tuple) -> None:
+    """Remove a cached result."""
+    global _results_bytes
+    _, value = _results.pop(key)
+    _results_bytes -= len(value)
+
+
+def _get(key: Tuple) -> Optional[bytes]:
+    """Return an unexpired cached result."""
+    entry = _results.get(key)
+    if entry is None:
+        return None
+
+    expires, value = entry
+    if expires < time.monotonic():
+        _drop(key)
+        return None
+
+    _results.move_to_end(key)
+    return value
+
+
+def _put(key: Tuple, value: bytes) -> None:
+    """Store a result, evicting the least recently used beyond the limits."""
+    global _results_bytes
+    if CACHE_TTL <= 0 or len(value) > CACHE_MAX_BYTES:
+        return
+
+    if key in _results:
+        _drop(key)
+    _results[key] = (time.monotonic() + CACHE_TTL, value)
+    _results_bytes += len(value)
+    while len(_results) > CACHE_SIZE or _results_bytes > CACHE_MAX_BYTES:
+        _drop(next(iter(_results)))
+
+
+def _disk_path(key: Tuple) -> Path:
+    """Return the on-disk location for a cache key."""
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+    return Path(CACHE_DIR) / digest[:2] / f"{digest}.bin"
+
+
+def _disk_get(path: Path) -> Optional[bytes]:
+    """Read a cached file, marking it recently used."""
+    try:
+        data = path.read_bytes()
+        os.utime(path)
+        return data
+    except FileNotFoundError:
+        return None
+
+
+def _disk_put(path: Path, value: bytes) -> None:
+    """Write a cached file atomically and evict the least recently used."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(value)
+    os.replace(tmp, path)
+
+    files = sorted(Path(CACHE_DIR).glob("*/*.bin"), key=lambda f: f.stat().st_mtime)
+    for stale in files[:-CACHE_DIR_MAX_FILES]:
+        stale.unlink(missing_ok=True)
+
+
+def cached_conversion(fn: Callable[..., Awaitable[bytes]]) -> Callable[..., Awaitable[bytes]]:
+    """
+    Cache and coalesce a converter's ``generate_*`` method.
+
+    Calls are keyed on the converter class, its base URL, every argument and
+    the presentation's content version, so an edited presentation is never
+    served from cache. Calls writing to an ``output_path`` or with unhashable
+    arguments bypass the cache. When the content version is unknown, only
+    concurrent identical calls are coalesced and nothing is stored.
+    """
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(self, *args: Any, **kwargs: Any) -> bytes:
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        params = dict(bound.arguments)
+        del params['self']
+
+        key = (type(self).__name__, fn.__name__, self.base_url, tuple(sorted(params.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return await fn(self, *args, **kwargs)
+        if params.get('output_path') is not None:
+            return await fn(self, *args, **kwargs)
+
+        version = await self._presentation_version(params['presentation_id'])
+        key += (version,)
+        disk_path = _disk_path(key) if CACHE_DIR and version else None
+
+        cached = _get(key) if version else None
+        if cached is None and disk_path is not None:
+            cached = await asyncio.to_thread(_disk_get, disk_path)
+            if cached is not None:
+                _put(key, cached)
+        if cached is not None:
+            logger.info(f"Serving cached {fn.__name__} result ({len(cached)} bytes)")
+            return cached
+
+        while key in _inflight:
+            pending = _inflight[key]
+            logger.info(f"Waiting for identical {fn.__name__} already in progress")
+            try:
+                # Shielded so a cancelled waiter does not cancel the shared result
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # This waiter itself was cancelled
+                # The request running it was cancelled; render (or wait) anew
+                logger.info(f"Identical {fn.__name__} was cancelled, retrying")
+
+        future = asyncio.get_running_loop().create_future()
+        _inflight[key] = future
+        try:
+            result = await fn(self, *args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Retrieved here; waiters re-raise it themselves
+            raise
+        finally:
+            del _inflight[key]
+
+        future.set_result(result)
+        if version is None:
+            return result
+        _put(key, result)
+        if disk_path is not None:
+            try:
+                await asyncio.to_thread(_disk_put, disk_path, result)
+            except OSError as e:
+                logger.warning(f"Failed to write conversion cache: {e}")
+        return result
+
+    return wrapper
@@ -5,8 +5,18 @@ This module provides functionality to convert presentations to editable PPTX for
 by mapping CSS Grid layouts to PowerPoint shapes and text boxes.
 """
 
+import asyncio
+import html
 import logging
 import io
+import json
+import re
+import os
+import shutil
+import subprocess
+import tempfile
+import zipfile
+from functools import lru_cache
 from typing import Optional, Tuple, List, Dict, Any
 from pathlib import Path
 from pptx import Presentation
@@ -16,9 +26,127 @@ from pptx.dml.color import RGBColor
 from PIL import Image
 
 from .base import BaseConverter
+from .cache import cached_conversion
 
 logger = logging.getLogger(__name__)
 
+# Optional lossless PNG optimizer, run once over the finished deck
+_OXIPNG = shutil.which('oxipng')
+
+# HTML markup: line breaks and block ends become newlines, inline formatting
+# disappears, any other tag separates words; bare < and > are left alone
+_BREAK_TAG_RE = re.compile(r'<br\s*/?>|</(?:p|li|div|h[1-6])\s*>', re.IGNORECASE)
+_INLINE_TAG_RE = re.compile(r'</?(?:a|b|code|em|i|mark|s|small|span|strong|sub|sup|u)\b[^>]*>', re.IGNORECASE)
+_TAG_RE = re.compile(r'</?[A-Za-z][^>]*>')
+_SPACES_RE = re.compile(r'[ \t\r\f\v]+')
+_NEWLINES_RE = re.compile(r'\s*\n\s*')
+# Background colors as #RGB or #RRGGBB (after strip().upper())
+_HEX_COLOR_RE = re.compile(r'#([0-9A-F]{3}|[0-9A-F]{6})')
+
+
+def _strip_html(text: Optional[str]) -> str:
+    """Reduce an HTML fragment to its plain text, keeping line breaks."""
+    if not text:
+        return ''
+    text = _BREAK_TAG_RE.sub('\n', text)
+    text = _INLINE_TAG_RE.sub('', text)
+    text = _TAG_RE.sub(' ', text)
+    text = _SPACES_RE.sub(' ', html.unescape(text))
+    return _NEWLINES_RE.sub('\n', text).strip()
+
+
+def _recompress_png(png_bytes: bytes, quantize: bool) -> bytes:
+    """
+    Re-encode a captured PNG to shrink it before embedding.
+
+    Args:
+        png_bytes: PNG bytes as returned by Chromium
+        quantize: Reduce to an adaptive 256-color palette (for flat-color
+                  charts and diagrams; not for photographic content)
+
+    Returns:
+        Optimized PNG bytes, or the original bytes if they were smaller
+    """
+    img = Image.open(io.BytesIO(png_bytes))
+    if quantize:
+        img = img.quantize(colors=256)
+
+    out = io.BytesIO()
+    img.save(out, format='PNG', optimize=True, compress_level=9)
+    optimized = out.getvalue()
+    return optimized if len(optimized) < len(png_bytes) else png_bytes
+
+
+@lru_cache(maxsize=64)
+def _hex_to_rgb(hex_color: str) -> Optional[RGBColor]:
+    """
+    Parse a ``#RGB`` or ``#RRGGBB`` color; decks reuse a handful, so results are cached.
+
+    Args:
+        hex_color: Normalized (stripped, uppercase) hex color
+
+    Returns:
+        Matching RGBColor, or None if the value is not a valid hex color
+    """
+    match = _HEX_COLOR_RE.fullmatch(hex_color)
+    if not match:
+        return None
+
+    digits = match[1]
+    if len(digits) == 3:
+        digits = ''.join(c * 2 for c in digits)
+    v = int(digits, 16)
+    return RGBColor(v >> 16, (v >> 8) & 0xFF, v & 0xFF)
+
+
+def _optimize_deck_media(pptx_bytes: bytes) -> bytes:
+    """
+    Losslessly shrink the PNG media of a saved deck with oxipng.
+
+    All PNGs are optimized by a single oxipng process; JPEG media is left
+    untouched.
+
+    Args:
+        pptx_bytes: Saved PPTX file
+
+    Returns:
+        PPTX bytes with optimized media, or the input if oxipng failed
+    """
+    with zipfile.ZipFile(io.BytesIO(pptx_bytes)) as src, tempfile.TemporaryDirectory() as tmp:
+        media = {}
+        for name in src.namelist():
+            if name.startswith('ppt/media/') and name.endswith('.png'):
+                path = os.path.join(tmp, f"{len(media)}.png")
+                with open(path, 'wb') as f:
+                    f.write(src.read(name))
+                media[name] = path
+
+        if not media:
+            return pptx_bytes
+
+        try:
+            subprocess.run(
+                [_OXIPNG, '-o', '2', '--strip', 'safe', '--quiet', *media.values()],
+                check=True,
+                capture_output=True,
+                timeout=120,
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"oxipng failed, keeping original media: {e}")
+            return pptx_bytes
+
+        out = io.BytesIO()
+        with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as dst:
+            for item in src.infolist():
+                if item.filename in media:
+                    with open(media[item.filename], 'rb') as f:
+                        dst.writestr(item, f.read())
+                else:
+                    dst.writestr(item, src.read(item))
+
+    logger.info(f"Optimized {len(media)} PNG(s) with oxipng")
+    return out.getvalue()
+
 
 class NativePPTXConverter(BaseConverter):
     """Convert presentations to native editable PPTX format."""
@@ -35,6 +163,32 @@ class NativePPTXConverter(BaseConverter):
     COL_WIDTH = PPTX_WIDTH / GRID_COLS
     ROW_HEIGHT = PPTX_HEIGHT / GRID_ROWS
 
+    # Grid coordinates -> (left, top, width, height), filled by _grid_to_inches
+    _GRID_CACHE: Dict[Tuple[int, int, int, int], Tuple[Inches, Inches, Inches, Inches]] = {}
+
+    # A 10in slide needs no retina captures; 1x quarters the image bytes
+    DEVICE_SCALE_FACTOR = 1.0
+
+    # Elements captured as images (hybrid capture) per layout, keyed by asset name
+    ELEMENT_SELECTORS = {
+        'L01': {'chart': '.chart-container[data-slide-index="{index}"]'},
+        'L02': {'diagram': '.diagram-container[data-slide-index="{index}"]'},
+        'L03': {
+            'chart1': '[data-section-type="chart1"][data-slide-index="{index}"]',
+            'chart2': '[data-section-type="chart2"][data-slide-index="{index}"]',
+        },
+        'L25': {'content': '.rich-content-area[data-slide-index="{index}"]'},
+        'L27': {'image': '.image-container[data-slide-index="{index}"]'},
+        'L29': {'hero': '.hero-content-area[data-slide-index="{index}"]'},
+    }
+
+    # Flat-color assets that survive palette quantization without visible loss
+    QUANTIZED_ASSETS = {'chart', 'chart1', 'chart2', 'diagram'}
+
+    # Photo-like assets captured as JPEG instead of PNG
+    JPEG_ASSETS = {'image', 'hero'}
+
+    @cached_conversion
     async def generate_pptx(
         self,
         presentation_id: str,
@@ -67,9 +221,26 @@ class NativePPTXConverter(BaseConverter):
         prs.slide_width = self.PPTX_WIDTH
         prs.slide_height = self.PPTX_HEIGHT
 
-        # Process each slide
         slides_data = presentation_data.get('slides', [])
-        for idx, slide_data in enumerate(slides_data):
+
+        # Phase 1: capture hybrid elements for all slides concurrently.
+        # Concurrency is bounded by the page pool; python-pptx is not touched.
+        async with self.with_context():
+            if slides_data:
+                try:
+                    await self._open_page_pool(
+                        presentation_id, min(self.PAGE_POOL_SIZE, len(slides_data))
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to open presentation for capture: {e}")
+
+            slide_assets = await asyncio.gather(*(
+                self._collect_assets(slide_data, idx, presentation_id)
+                for idx, slide_data in enumerate(slides_data)
+            ))
+
+        # Phase 2: build slides serially
+        for idx, (slide_data, assets) in enumerate(zip(slides_data, slide_assets)):
             logger.info(f"Processing slide {idx + 1}/{len(slides_data)}")
             
             # Create blank slide
@@ -83,35 +254,29 @@ class NativePPTXConverter(BaseConverter):
             layout_type = slide_data.get('layout', 'L01')
             content = slide_data.get('content', {})
             
-            if layout_type == 'L01':
-                await self._render_L01(slide, content, idx, presentation_id)
-            elif layout_type == 'L02':
-                await self._render_L02(slide, content, idx, presentation_id)
-            elif layout_type == 'L03':
-                await self._render_L03(slide, content, idx, presentation_id)
-            elif layout_type == 'L25':
-                await self._render_L25(slide, content, idx, presentation_id)
-            elif layout_type == 'L27':
-                await self._render_L27(slide, content, idx, presentation_id)
-            elif layout_type == 'L29':
-                await self._render_L29(slide, content, idx, presentation_id)
+            handler = self._LAYOUTS.get(layout_type)
+            if handler:
+                handler(self, slide, content, assets)
             else:
                 logger.warning(f"Unsupported layout {layout_type}, skipping content")
 
-        # Save to bytes
-        pptx_buffer = io.BytesIO()
-        prs.save(pptx_buffer)
-        pptx_bytes = pptx_buffer.getvalue()
+        if _OXIPNG:
+            pptx_bytes = await self._run_image_task(_optimize_deck_media, await self._save_document(prs))
+            if output_path:
+                output_path.write_bytes(pptx_bytes)
+        else:
+            pptx_bytes = await self._save_document(prs, output_path)
 
         if output_path:
-            output_path.write_bytes(pptx_bytes)
             logger.info(f"Native PPTX saved to: {output_path}")
-
         return pptx_bytes
 
-    def _grid_to_inches(self, col_start: int, col_end: int, row_start: int, row_end: int) -> Tuple[Inches, Inches, Inches, Inches]:
+    @classmethod
+    def _grid_to_inches(cls, col_start: int, col_end: int, row_start: int, row_end: int) -> Tuple[Inches, Inches, Inches, Inches]:
         """
         Convert CSS Grid coordinates to PowerPoint position and size.
+
+        Results depend only on class constants, so they are cached per grid.
         
         Args:
             col_start: Starting column line (1-based)
@@ -122,15 +287,57 @@ class NativePPTXConverter(BaseConverter):
         Returns:
             Tuple of (left, top, width, height) in Inches
         """
+        key = (col_start, col_end, row_start, row_end)
+        cached = cls._GRID_CACHE.get(key)
+        if cached is not None:
+            return cached
+
         # CSS Grid is 1-based, so subtract 1 for 0-based offset
-        left = (col_start - 1) * self.COL_WIDTH
-        top = (row_start - 1) * self.ROW_HEIGHT
+        left = (col_start - 1) * cls.COL_WIDTH
+        top = (row_start - 1) * cls.ROW_HEIGHT
         
         # Width/Height is the span
-        width = (col_end - col_start) * self.COL_WIDTH
-        height = (row_end - row_start) * self.ROW_HEIGHT
+        width = (col_end - col_start) * cls.COL_WIDTH
+        height = (row_end - row_start) * cls.ROW_HEIGHT
         
-        return (left, top, width, height)
+        cls._GRID_CACHE[key] = (left, top, width, height)
+        return cls._GRID_CACHE[key]
+
+    async def _collect_assets(self, slide_data: Dict[str, Any], slide_index: int, presentation_id: str) -> Dict[str, bytes]:
+        """
+        Capture the hybrid elements a slide's layout needs.
+
+        Args:
+            slide_data: Slide JSON data
+            slide_index: The index of the slide (0-based)
+            presentation_id: The UUID of the presentation
+
+        Returns:
+            Mapping of asset name to image bytes (JPEG for photo-like assets,
+            optimized PNG otherwise); missing elements are omitted
+        """
+        templates = self.ELEMENT_SELECTORS.get(slide_data.get('layout', 'L01'))
+        if not templates:
+            return {}
+
+        selectors = {name: template.format(index=slide_index) for name, template in templates.items()}
+
+        # Photo-like layouts are captured as JPEG; anything with text stays PNG
+        if templates.keys() <= self.JPEG_ASSETS:
+            captures = await self.capture_elements(
+                presentation_id, slide_index, list(selectors.values()), screenshot_format='jpeg'
+            )
+            return {name: captures[selector] for name, selector in selectors.items() if selector in captures}
+
+        captures = await self.capture_elements(presentation_id, slide_index, list(selectors.values()))
+
+        # Recompress off the event loop so other slides keep capturing meanwhile
+        names = [name for name, selector in selectors.items() if selector in captures]
+        optimized = await asyncio.gather(*(
+            self._run_image_task(_recompress_png, captures[selectors[name]], name in self.QUANTIZED_ASSETS)
+            for name in names
+        ))
+        return dict(zip(names, optimized))
 
     def _apply_background(self, slide, slide_data):
         """Apply background color or image to slide."""
@@ -138,17 +345,17 @@ class NativePPTXConverter(BaseConverter):
         # TODO: Handle background images
         
         if bg_color:
-            background = slide.background
-            fill = background.fill
+            # Parse hex color (e.g., #FFFFFF or #FFF)
+            rgb = _hex_to_rgb(bg_color.strip().upper())
+            if rgb is None:
+                logger.warning(f"Ignoring invalid background color: {bg_color!r}")
+                return
+
+            fill = slide.background.fill
             fill.solid()
-            # Parse hex color (e.g., #FFFFFF)
-            if bg_color.startswith('#'):
-                r = int(bg_color[1:3], 16)
-                g = int(bg_color[3:5], 16)
-                b = int(bg_color[5:7], 16)
-                fill.fore_color.rgb = RGBColor(r, g, b)
-
-    async def _render_L01(self, slide, content, slide_index, presentation_id):
+            fill.fore_color.rgb = rgb
+
+    def _render_L01(self, slide, content, assets):
         """
         Render L01 Layout: Centered Chart/Diagram with text.
         
@@ -178,11 +385,8 @@ class NativePPTXConverter(BaseConverter):
             color=RGBColor(107, 114, 128)  # #6b7280
         )
         
-        # 3. Chart (Hybrid Capture)
-        # We need to capture the element at .chart-container
-        # Selector: .chart-container[data-slide-index="{slide_index}"]
-        selector = f'.chart-container[data-slide-index="{slide_index}"]'
-        chart_bytes = await self.capture_element_screenshot(presentation_id, slide_index, selector)
+        # 3. Chart (Hybrid Capture of .chart-container)
+        chart_bytes = assets.get('chart')
         
         if chart_bytes:
             left, top, width, height = self._grid_to_inches(2, 32, 5, 15)
@@ -207,7 +411,7 @@ class NativePPTXConverter(BaseConverter):
                 color=RGBColor(31, 41, 55)
             )
 
-    async def _render_L02(self, slide, content, slide_index, presentation_id):
+    def _render_L02(self, slide, content, assets):
         """
         Render L02 Layout: Left Diagram with Text Box on Right.
         
@@ -237,22 +441,16 @@ class NativePPTXConverter(BaseConverter):
         )
         
         # 3. Diagram (Left) - Hybrid Capture
-        # Selector: .diagram-container[data-slide-index="{slide_index}"]
-        selector = f'.diagram-container[data-slide-index="{slide_index}"]'
-        diagram_bytes = await self.capture_element_screenshot(presentation_id, slide_index, selector)
+        diagram_bytes = assets.get('diagram')
         
         if diagram_bytes:
             left, top, width, height = self._grid_to_inches(2, 23, 5, 17)
             slide.shapes.add_picture(io.BytesIO(diagram_bytes), left, top, width, height)
             
-        # 4. Text (Right)
-        # Note: element_2 might be HTML, but we'll render as plain text for now
-        text_content = content.get('element_2', '')
-        # Simple HTML tag stripping if needed, or just dump it
-        # For now, assuming it's readable text
+        # 4. Text (Right) - element_2 may be HTML; _add_text_box strips tags
         self._add_text_box(
             slide,
-            text=text_content,
+            text=content.get('element_2', ''),
             grid=(23, 32, 5, 17),
             font_size=15,  # 20px -> 15pt
             color=RGBColor(55, 65, 81)
@@ -268,7 +466,7 @@ class NativePPTXConverter(BaseConverter):
                 color=RGBColor(31, 41, 55)
             )
 
-    async def _render_L03(self, slide, content, slide_index, presentation_id):
+    def _render_L03(self, slide, content, assets):
         """
         Render L03 Layout: Two Charts in Columns with Text Below.
         """
@@ -279,15 +477,13 @@ class NativePPTXConverter(BaseConverter):
         self._add_text_box(slide, content.get('element_1', ''), (2, 32, 3, 4), 18, False, RGBColor(107, 114, 128))
         
         # 3. Left Chart (Hybrid)
-        selector_left = f'[data-section-type="chart1"][data-slide-index="{slide_index}"]'
-        chart1_bytes = await self.capture_element_screenshot(presentation_id, slide_index, selector_left)
+        chart1_bytes = assets.get('chart1')
         if chart1_bytes:
             left, top, width, height = self._grid_to_inches(2, 16, 5, 14)
             slide.shapes.add_picture(io.BytesIO(chart1_bytes), left, top, width, height)
             
         # 4. Right Chart (Hybrid)
-        selector_right = f'[data-section-type="chart2"][data-slide-index="{slide_index}"]'
-        chart2_bytes = await self.capture_element_screenshot(presentation_id, slide_index, selector_right)
+        chart2_bytes = assets.get('chart2')
         if chart2_bytes:
             left, top, width, height = self._grid_to_inches(17, 31, 5, 14)
             slide.shapes.add_picture(io.BytesIO(chart2_bytes), left, top, width, height)
@@ -302,7 +498,7 @@ class NativePPTXConverter(BaseConverter):
         if content.get('presentation_name'):
             self._add_text_box(slide, content.get('presentation_name'), (2, 7, 18, 19), 14, False, RGBColor(31, 41, 55))
 
-    async def _render_L25(self, slide, content, slide_index, presentation_id):
+    def _render_L25(self, slide, content, assets):
         """
         Render L25 Layout: Main Content Shell (Hybrid Rich Content).
         """
@@ -314,9 +510,7 @@ class NativePPTXConverter(BaseConverter):
         self._add_text_box(slide, subtitle, (2, 32, 4, 5), 18, False, RGBColor(107, 114, 128))
         
         # 3. Rich Content (Hybrid Capture)
-        # Selector: .rich-content-area[data-slide-index="{slide_index}"]
-        selector = f'.rich-content-area[data-slide-index="{slide_index}"]'
-        content_bytes = await self.capture_element_screenshot(presentation_id, slide_index, selector)
+        content_bytes = assets.get('content')
         if content_bytes:
             left, top, width, height = self._grid_to_inches(2, 32, 5, 17)
             slide.shapes.add_picture(io.BytesIO(content_bytes), left, top, width, height)
@@ -325,13 +519,12 @@ class NativePPTXConverter(BaseConverter):
         if content.get('presentation_name'):
             self._add_text_box(slide, content.get('presentation_name'), (2, 7, 18, 19), 14, False, RGBColor(31, 41, 55))
 
-    async def _render_L27(self, slide, content, slide_index, presentation_id):
+    def _render_L27(self, slide, content, assets):
         """
         Render L27 Layout: Image Left with Content Right.
         """
         # 1. Left Image (Hybrid Capture of container to handle bg/img logic)
-        selector = f'.image-container[data-slide-index="{slide_index}"]'
-        img_bytes = await self.capture_element_screenshot(presentation_id, slide_index, selector)
+        img_bytes = assets.get('image')
         if img_bytes:
             left, top, width, height = self._grid_to_inches(1, 12, 1, 19)
             slide.shapes.add_picture(io.BytesIO(img_bytes), left, top, width, height)
@@ -349,20 +542,29 @@ class NativePPTXConverter(BaseConverter):
         if content.get('presentation_name'):
             self._add_text_box(slide, content.get('presentation_name'), (13, 18, 18, 19), 14, False, RGBColor(31, 41, 55))
 
-    async def _render_L29(self, slide, content, slide_index, presentation_id):
+    def _render_L29(self, slide, content, assets):
         """
         Render L29 Layout: Hero Full-Bleed (Full Slide Hybrid Capture).
         """
         # Capture the entire hero content area which spans the whole slide
-        selector = f'.hero-content-area[data-slide-index="{slide_index}"]'
-        hero_bytes = await self.capture_element_screenshot(presentation_id, slide_index, selector)
+        hero_bytes = assets.get('hero')
         if hero_bytes:
             left, top, width, height = self._grid_to_inches(1, 33, 1, 19) # Full slide 1-32 cols, 1-18 rows
             slide.shapes.add_picture(io.BytesIO(hero_bytes), left, top, width, height)
-            
+
+    # Layout renderers keyed by layout type (unbound; called with self)
+    _LAYOUTS = {
+        'L01': _render_L01,
+        'L02': _render_L02,
+        'L03': _render_L03,
+        'L25': _render_L25,
+        'L27': _render_L27,
+        'L29': _render_L29,
+    }
 
     def _add_text_box(self, slide, text, grid, font_size, is_bold=False, color=None, align=PP_ALIGN.LEFT):
-        """Helper to add a text box mapped to grid."""
+        """Helper to add a text box mapped to grid. HTML tags in text are stripped."""
+        text = _strip_html(text)
         if not text:
             return
             
@@ -386,7 +588,6 @@ class NativePPTXConverter(BaseConverter):
         """Fetch presentation JSON data from API."""
         # This requires the base_url to be set correctly to the API server
         # We might need to adjust base_url logic if API is on a different port/path
-        import aiohttp
         
         # Assuming API is at {base_url}/api/presentations/{id}
         # We need to handle the case where base_url is the viewer URL
@@ -395,11 +596,16 @@ class NativePPTXConverter(BaseConverter):
         
         # HACK: For now, we'll try to fetch from the same base URL
         api_url = f"{self.base_url}/api/presentations/{presentation_id}"
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(api_url) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                else:
-                    logger.error(f"Failed to fetch presentation data: {resp.status}")
-                    return {}
+
+        # Reuse the body the conversion cache's version check just fetched
+        body = self._presentation_bodies.pop(presentation_id, None)
+        if body is not None:
+            return json.loads(body)
+
+        session = await self._get_http()
+        async with session.get(api_url) as resp:
+            if resp.status == 200:
+                return await resp.json()
+            else:
+                logger.error(f"Failed to fetch presentation data: {resp.status}")
+                return {}
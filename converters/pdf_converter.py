@@ -7,16 +7,62 @@ using Playwright's native PDF export capabilities.
 
 import logging
 from pathlib import Path
-from typing import Optional
-from playwright.async_api import async_playwright
-from .base import BaseConverter
+from typing import List, Optional
+import img2pdf
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from .base import BaseConverter, _BrowserSingleton
+from .cache import cached_conversion
 
 logger = logging.getLogger(__name__)
 
+# One PDF page per slide at the slide's CSS size in points
+_PAGE_LAYOUT = img2pdf.get_layout_fun((BaseConverter.SLIDE_WIDTH, BaseConverter.SLIDE_HEIGHT))
+
+
+def _jpegs_to_pdf(jpegs: List[bytes]) -> bytes:
+    """Embed JPEG slide captures as PDF pages without decoding or re-encoding them."""
+    return img2pdf.convert(jpegs, layout_fun=_PAGE_LAYOUT)
+
 
 class PDFConverter(BaseConverter):
     """Convert presentations to PDF format using Playwright."""
 
+    # Print scale per quality setting (legacy print-mode path)
+    PDF_SCALES = {
+        "high": 1.0,
+        "medium": 0.85,
+        "low": 0.7
+    }
+
+    # CSS hiding debug UI in Reveal.js print-pdf mode
+    PRINT_CSS = """
+        /* Hide all debug UI elements */
+        .debug-badge,
+        .reveal-controls,
+        .reveal-progress,
+        [class*='debug'],
+        footer.controls,
+        .controls-help,
+        button[aria-label*='help'],
+        button[aria-label*='overlay'],
+        .badge,
+        [style*='v7.5-main'] {
+            display: none !important;
+            visibility: hidden !important;
+        }
+
+        /* Ensure clean print output */
+        @media print {
+            .debug-badge,
+            .reveal-controls,
+            .reveal-progress,
+            footer.controls {
+                display: none !important;
+            }
+        }
+    """
+
+    @cached_conversion
     async def generate_pdf(
         self,
         presentation_id: str,
@@ -99,32 +145,35 @@ class PDFConverter(BaseConverter):
         """
         logger.info(f"Generating PDF for presentation: {presentation_id}")
 
-        # Initialize browser with appropriate settings
-        playwright = await async_playwright().start()
+        # Open an isolated context on the shared (possibly CDP-attached) browser
+        browser = await _BrowserSingleton.acquire()
+        context = None
 
         try:
-            # Launch browser
-            browser = await playwright.chromium.launch(
-                headless=True,
-                args=['--disable-web-security']
-            )
-
             # Create page with proper 16:9 viewport for presentations
             # Using higher resolution for better quality
             viewport_width = 1920 if quality == "high" else 1440 if quality == "medium" else 960
             viewport_height = 1080 if quality == "high" else 810 if quality == "medium" else 540
 
-            page = await browser.new_page(
+            context = await browser.new_context(
                 viewport={'width': viewport_width, 'height': viewport_height}
             )
+            # Hide debug UI from the first paint rather than restyling after load.
+            # The @page rule is the fallback 16:9 sheet when the deck's print CSS
+            # does not size pages itself (Reveal's print-pdf stylesheet does)
+            page_size = "16in 9in" if landscape else "9in 16in"
+            await self._inject_clean_css(
+                context, self.PRINT_CSS + f"@page {{ size: {page_size}; margin: 0; }}"
+            )
+            page = await context.new_page()
 
             # Build presentation URL with print-pdf parameter for Reveal.js
             # This enables Reveal.js print mode which layouts all slides for PDF
             url = f"{self.base_url}/p/{presentation_id}?print-pdf"
             logger.info(f"Navigating to: {url} (print-pdf mode)")
 
-            # Navigate to presentation
-            response = await page.goto(url, wait_until='networkidle', timeout=30000)
+            # Navigate to presentation; .reveal.ready below is the readiness signal
+            response = await page.goto(url, wait_until='domcontentloaded', timeout=15000)
 
             if not response or response.status != 200:
                 raise ValueError(f"Failed to load presentation: {presentation_id}")
@@ -133,41 +182,21 @@ class PDFConverter(BaseConverter):
             await page.wait_for_selector('.reveal.ready', timeout=15000)
             logger.info("Reveal.js initialized successfully")
 
-            # Inject CSS to hide debug UI elements
-            await page.add_style_tag(content="""
-                /* Hide all debug UI elements */
-                .debug-badge,
-                .reveal-controls,
-                .reveal-progress,
-                [class*='debug'],
-                footer.controls,
-                .controls-help,
-                button[aria-label*='help'],
-                button[aria-label*='overlay'],
-                .badge,
-                [style*='v7.5-main'] {
-                    display: none !important;
-                    visibility: hidden !important;
-                }
-
-                /* Ensure clean print output */
-                @media print {
-                    .debug-badge,
-                    .reveal-controls,
-                    .reveal-progress,
-                    footer.controls {
-                        display: none !important;
-                    }
-                }
-            """)
-
-            # Additional wait for any dynamic content and CSS to apply
-            await page.wait_for_timeout(2000)
+            # Only wait for web fonts and slide images, instead of sleeping for
+            # a fixed time
+            try:
+                await page.wait_for_function("""
+                    () => document.fonts.status === 'loaded'
+                        && Array.from(document.images).every(img => img.complete)
+                """, timeout=10000)
+            except PlaywrightTimeoutError:
+                # Lazy or broken images never complete; print what has loaded
+                logger.warning("Fonts/images not fully loaded after 10000ms, printing anyway")
 
             # Set PDF dimensions based on quality
             scale = self._get_scale_factor(quality)
 
-            # PDF options for true 16:9 aspect ratio
+            # Page size comes from CSS @page rules only
             pdf_options = {
                 "landscape": landscape,
                 "print_background": print_background,
@@ -181,16 +210,6 @@ class PDFConverter(BaseConverter):
                 }
             }
 
-            # Set proper 16:9 dimensions (true aspect ratio)
-            if landscape:
-                # True 16:9 aspect ratio for presentation slides
-                pdf_options["width"] = "16in"   # 16:9 ratio
-                pdf_options["height"] = "9in"   # 16:9 ratio
-            else:
-                # Portrait mode (9:16)
-                pdf_options["width"] = "9in"
-                pdf_options["height"] = "16in"
-
             # Save to file if path provided
             if output_path:
                 pdf_options["path"] = str(output_path)
@@ -200,21 +219,17 @@ class PDFConverter(BaseConverter):
             pdf_bytes = await page.pdf(**pdf_options)
 
             logger.info(f"PDF generated successfully ({len(pdf_bytes)} bytes)")
-
-            # Close browser
-            await browser.close()
-            await playwright.stop()
-
             return pdf_bytes
 
         except Exception as e:
             logger.error(f"PDF generation failed: {e}", exc_info=True)
-            if 'browser' in locals():
-                await browser.close()
-            if 'playwright' in locals():
-                await playwright.stop()
             raise RuntimeError(f"PDF generation failed: {e}") from e
 
+        finally:
+            if context:
+                await context.close()
+            _BrowserSingleton.release()
+
     def _get_scale_factor(self, quality: str) -> float:
         """
         Get scale factor based on quality setting.
@@ -225,12 +240,7 @@ class PDFConverter(BaseConverter):
         Returns:
             Scale factor for PDF generation
         """
-        quality_map = {
-            "high": 1.0,
-            "medium": 0.85,
-            "low": 0.7
-        }
-        return quality_map.get(quality, 1.0)
+        return self.PDF_SCALES.get(quality, 1.0)
 
     async def generate_pdf_from_screenshots(
         self,
@@ -253,53 +263,24 @@ class PDFConverter(BaseConverter):
         Returns:
             PDF file as bytes
         """
-        from PIL import Image
-        import io
-
         logger.info(f"Generating PDF from screenshots for: {presentation_id}")
 
         # Capture screenshots
-        screenshots = await self.capture_slide_screenshots(presentation_id, slide_count)
-
-        # Convert screenshots to images
-        images = []
-        for screenshot_bytes in screenshots:
-            img = Image.open(io.BytesIO(screenshot_bytes))
-            # Convert RGBA to RGB if necessary
-            if img.mode == 'RGBA':
-                rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-                rgb_img.paste(img, mask=img.split()[3])  # Use alpha channel as mask
-                img = rgb_img
-            images.append(img)
-
-        # Save as PDF
-        if images:
-            pdf_buffer = io.BytesIO()
-
-            # Save first image and append rest
-            # Resize images to standard 1920x1080 to ensure correct PDF page size
-            # This fixes the "content shift" and "white bars" issues caused by high-DPI screenshots
-            resized_images = []
-            for img in images:
-                if img.width != 1920 or img.height != 1080:
-                    img = img.resize((1920, 1080), Image.Resampling.LANCZOS)
-                resized_images.append(img)
-            
-            resized_images[0].save(
-                pdf_buffer,
-                format='PDF',
-                save_all=True,
-                append_images=resized_images[1:] if len(resized_images) > 1 else []
-            )
+        screenshots = await self.capture_slide_screenshots(
+            presentation_id, slide_count, screenshot_format='jpeg'
+        )
 
-            pdf_bytes = pdf_buffer.getvalue()
+        if not screenshots:
+            raise RuntimeError("No screenshots captured for PDF generation")
 
-            # Save to file if path provided
-            if output_path:
-                output_path.write_bytes(pdf_bytes)
-                logger.info(f"PDF saved to: {output_path}")
+        # Embed the JPEG captures directly. Pages are sized to the slide, not
+        # to the high-DPI capture, which avoids content shift and white bars
+        pdf_bytes = await self._run_image_task(_jpegs_to_pdf, screenshots)
 
-            logger.info(f"PDF generated from {len(images)} screenshots ({len(pdf_bytes)} bytes)")
-            return pdf_bytes
+        # Save to file if path provided
+        if output_path:
+            output_path.write_bytes(pdf_bytes)
+            logger.info(f"PDF saved to: {output_path}")
 
-        raise RuntimeError("No screenshots captured for PDF generation")
+        logger.info(f"PDF generated from {len(screenshots)} screenshots ({len(pdf_bytes)} bytes)")
+        return pdf_bytes
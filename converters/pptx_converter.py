@@ -5,6 +5,7 @@ This module provides functionality to convert presentations to PowerPoint
 format by capturing slides as screenshots and embedding them in PPTX.
 """
 
+import asyncio
 import io
 import logging
 from pathlib import Path
@@ -13,6 +14,7 @@ from pptx import Presentation
 from pptx.util import Inches
 from PIL import Image
 from .base import BaseConverter
+from .cache import cached_conversion
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +26,20 @@ class PPTXConverter(BaseConverter):
     PPTX_WIDTH = Inches(10)
     PPTX_HEIGHT = Inches(5.625)  # 10 * 9/16 for 16:9 aspect ratio
 
+    # Slide (width, height) per aspect ratio
+    SLIDE_DIMENSIONS = {
+        "16:9": (PPTX_WIDTH, PPTX_HEIGHT),
+        "4:3": (Inches(10), Inches(7.5)),  # 10 * 3/4
+    }
+
+    # Screenshot resolution per quality setting
+    IMAGE_SCALES = {
+        "high": 1.0,      # Full resolution (1920x1080)
+        "medium": 0.75,   # 75% resolution (1440x810)
+        "low": 0.5        # 50% resolution (960x540)
+    }
+
+    @cached_conversion
     async def generate_pptx(
         self,
         presentation_id: str,
@@ -53,6 +69,39 @@ class PPTXConverter(BaseConverter):
             RuntimeError: If PPTX generation fails
         """
         logger.info(f"Generating PPTX for presentation: {presentation_id}")
+
+        prs = await self._build_presentation(presentation_id, slide_count, aspect_ratio, quality)
+
+        pptx_bytes = await self._save_document(prs, output_path)
+        if output_path:
+            logger.info(f"PPTX saved to: {output_path}")
+
+        logger.info(f"PPTX generated successfully ({len(pptx_bytes)} bytes)")
+        return pptx_bytes
+
+    async def _build_presentation(
+        self,
+        presentation_id: str,
+        slide_count: int,
+        aspect_ratio: str = "16:9",
+        quality: str = "high"
+    ) -> Presentation:
+        """
+        Capture the slides and assemble them into an unsaved presentation.
+
+        Args:
+            presentation_id: The UUID of the presentation
+            slide_count: Number of slides in the presentation
+            aspect_ratio: Aspect ratio - '16:9' or '4:3' (default: '16:9')
+            quality: Quality setting - 'high', 'medium', or 'low'
+
+        Returns:
+            In-memory python-pptx Presentation
+
+        Raises:
+            ValueError: If invalid parameters
+            RuntimeError: If capture or assembly fails
+        """
         logger.info(f"Aspect ratio: {aspect_ratio}, Quality: {quality}, Slides: {slide_count}")
 
         # Validate parameters
@@ -65,7 +114,11 @@ class PPTXConverter(BaseConverter):
         try:
             # Capture screenshots of all slides
             logger.info("Capturing slide screenshots...")
-            screenshots = await self.capture_slide_screenshots(presentation_id, slide_count)
+            # Lossless captures only where the deck keeps lossless images
+            screenshot_format = 'png' if quality == "high" else 'jpeg'
+            screenshots = await self.capture_slide_screenshots(
+                presentation_id, slide_count, screenshot_format=screenshot_format
+            )
 
             if not screenshots:
                 raise RuntimeError("No screenshots captured")
@@ -78,48 +131,37 @@ class PPTXConverter(BaseConverter):
             # Set slide dimensions based on aspect ratio
             prs.slide_width, prs.slide_height = self._get_slide_dimensions_pptx(aspect_ratio)
 
+            # Re-encode all screenshots in parallel on the image workers,
+            # releasing each capture as soon as it is no longer needed
+            async def encode(idx: int) -> bytes:
+                image_bytes = await self._run_image_task(self._encode_slide, screenshots[idx], quality)
+                screenshots[idx] = None
+                return image_bytes
+
+            encoded = await asyncio.gather(*(encode(idx) for idx in range(len(screenshots))))
+
             # Add each screenshot as a slide
-            for idx, screenshot_bytes in enumerate(screenshots):
-                logger.info(f"Adding slide {idx + 1}/{len(screenshots)} to PPTX")
+            for idx, image_bytes in enumerate(encoded):
+                logger.info(f"Adding slide {idx + 1}/{len(encoded)} to PPTX")
 
                 # Create blank slide layout
                 blank_slide_layout = prs.slide_layouts[6]  # Blank layout
                 slide = prs.slides.add_slide(blank_slide_layout)
 
-                # Convert screenshot bytes to PIL Image
-                img = Image.open(io.BytesIO(screenshot_bytes))
-
-                # Optimize image based on quality setting
-                img = self._optimize_image(img, quality)
-
-                # Convert back to bytes
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, format='PNG', optimize=True)
-                img_buffer.seek(0)
-
                 # Add image to slide (fill entire slide)
                 slide.shapes.add_picture(
-                    img_buffer,
+                    io.BytesIO(image_bytes),
                     left=0,
                     top=0,
                     width=prs.slide_width,
                     height=prs.slide_height
                 )
 
+                # python-pptx keeps its own copy of the image
+                encoded[idx] = None
                 logger.info(f"Slide {idx + 1} added successfully")
 
-            # Save to BytesIO
-            pptx_buffer = io.BytesIO()
-            prs.save(pptx_buffer)
-            pptx_bytes = pptx_buffer.getvalue()
-
-            # Save to file if path provided
-            if output_path:
-                output_path.write_bytes(pptx_bytes)
-                logger.info(f"PPTX saved to: {output_path}")
-
-            logger.info(f"PPTX generated successfully ({len(pptx_bytes)} bytes)")
-            return pptx_bytes
+            return prs
 
         except Exception as e:
             logger.error(f"PPTX generation failed: {e}", exc_info=True)
@@ -135,16 +177,43 @@ class PPTXConverter(BaseConverter):
         Returns:
             Tuple of (width, height) in EMUs (English Metric Units)
         """
-        if aspect_ratio == "16:9":
-            return (self.PPTX_WIDTH, self.PPTX_HEIGHT)
-        elif aspect_ratio == "4:3":
-            # 4:3 aspect ratio
-            width = Inches(10)
-            height = Inches(7.5)  # 10 * 3/4
-            return (width, height)
+        # Default to 16:9
+        return self.SLIDE_DIMENSIONS.get(aspect_ratio, self.SLIDE_DIMENSIONS["16:9"])
+
+    def _encode_slide(self, screenshot_bytes: bytes, quality: str) -> bytes:
+        """
+        Resize a slide screenshot for the quality setting and encode it.
+
+        'high' keeps lossless PNG; 'medium' and 'low' use JPEG, which encodes
+        faster and is several times smaller. Runs on an image worker thread.
+
+        Args:
+            screenshot_bytes: Screenshot as captured
+            quality: Quality level - 'high', 'medium', or 'low'
+
+        Returns:
+            Image bytes to embed
+        """
+        img = Image.open(io.BytesIO(screenshot_bytes))
+
+        # Optimize image based on quality setting
+        img = self._optimize_image(img, quality)
+
+        img_buffer = io.BytesIO()
+        if quality == "high":
+            img.save(img_buffer, format='PNG', optimize=True)
         else:
-            # Default to 16:9
-            return (self.PPTX_WIDTH, self.PPTX_HEIGHT)
+            # Screenshots are opaque, so nothing is lost by dropping alpha
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            img.save(
+                img_buffer,
+                format='JPEG',
+                quality=self.JPEG_QUALITY,
+                optimize=True,
+                progressive=True
+            )
+        return img_buffer.getvalue()
 
     def _optimize_image(self, img: Image.Image, quality: str) -> Image.Image:
         """
@@ -157,14 +226,7 @@ class PPTXConverter(BaseConverter):
         Returns:
             Optimized PIL Image
         """
-        # Quality settings determine max dimensions
-        quality_settings = {
-            "high": 1.0,      # Full resolution (1920x1080)
-            "medium": 0.75,   # 75% resolution (1440x810)
-            "low": 0.5        # 50% resolution (960x540)
-        }
-
-        scale = quality_settings.get(quality, 1.0)
+        scale = self.IMAGE_SCALES.get(quality, 1.0)
 
         if scale < 1.0:
             new_width = int(img.width * scale)
@@ -197,11 +259,7 @@ class PPTXConverter(BaseConverter):
         """
         logger.info("Generating PPTX with speaker notes...")
 
-        # First generate base PPTX
-        pptx_bytes = await self.generate_pptx(presentation_id, slide_count)
-
-        # Load PPTX for modification
-        prs = Presentation(io.BytesIO(pptx_bytes))
+        prs = await self._build_presentation(presentation_id, slide_count)
 
         # Add notes to each slide
         for idx, slide in enumerate(prs.slides):
@@ -210,10 +268,8 @@ class PPTXConverter(BaseConverter):
                 notes_slide.notes_text_frame.text = notes[idx]
                 logger.info(f"Added notes to slide {idx + 1}")
 
-        # Save modified PPTX
-        pptx_buffer = io.BytesIO()
-        prs.save(pptx_buffer)
-        pptx_bytes = pptx_buffer.getvalue()
+        # Save once, with the notes in place
+        pptx_bytes = await self._save_document(prs)
 
         logger.info("Speaker notes added successfully")
         return pptx_bytes
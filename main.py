@@ -14,14 +14,24 @@ This service:
 Port: 8010 (default)
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 
+# Records are formatted by the QueueHandler and written to stdout by a
+# listener thread, so log calls never block the event loop on I/O
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.StreamHandler(sys.stdout)
+        logging.handlers.QueueHandler(log_queue)
     ]
 )
 
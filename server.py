@@ -6,21 +6,44 @@ REST API for converting v7.5-main presentations to PDF/PPTX formats.
 """
 
 import os
-import io
+import re
+import json
+import uuid
+import asyncio
+import hashlib
+import importlib.metadata
 import logging
-from typing import Optional, Literal
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
+from typing import Annotated, List, Optional, Literal, Tuple, Union
+from urllib.parse import quote
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field
 import uvicorn
 
 from converters.pdf_converter import PDFConverter
 from converters.pptx_converter import PPTXConverter
 from converters.native_pptx_converter import NativePPTXConverter
+from converters import base as converter_base
+from converters.base import BaseConverter
 
 logger = logging.getLogger(__name__)
 
+# Viewer URL: {base_url}/p/{presentation_id}[/][?query][#fragment]
+PRESENTATION_URL_RE = re.compile(r"^(?P<base>.+?)/p/(?P<pid>[^/?#]+)")
+
+# Cache-Control sent with downloads; clients revalidate with If-None-Match
+DOWNLOAD_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=86400"
+
+# Media type of .pptx downloads
+PPTX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+# Batch items rendered at once per /convert/batch request
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+# Download filename, percent-encoded since IDs come straight from the URL
+CONTENT_DISPOSITION_FMT = "attachment; filename=\"{0}\"; filename*=UTF-8''{0}"
+
 # FastAPI app
 app = FastAPI(
     title="v7.5 Download Service",
@@ -42,6 +65,10 @@ app.add_middleware(
 # Request Models
 class PDFConversionRequest(BaseModel):
     """Request model for PDF conversion"""
+    # Unknown fields from older clients (e.g. landscape, aspect_ratio) are
+    # dropped without validation instead of causing 422 errors
+    model_config = ConfigDict(extra="ignore")
+
     presentation_url: str = Field(
         ...,
         description="Full URL to presentation (e.g., https://v75-main.railway.app/p/{id})",
@@ -57,13 +84,12 @@ class PDFConversionRequest(BaseModel):
         default="high",
         description="Quality level for PDF generation (high: 1920×1080, medium: 1440×810, low: 960×540)"
     )
-    # Allow extra fields to prevent 422 errors from older clients
-    landscape: Optional[bool] = None
-    aspect_ratio: Optional[str] = None
 
 
 class PPTXConversionRequest(BaseModel):
     """Request model for PPTX conversion"""
+    model_config = ConfigDict(extra="ignore")
+
     presentation_url: str = Field(
         ...,
         description="Full URL to presentation (e.g., https://v75-main.railway.app/p/{id})",
@@ -89,67 +115,226 @@ class PPTXConversionRequest(BaseModel):
     )
 
 
+class BatchPDFItem(PDFConversionRequest):
+    """PDF conversion within a batch"""
+    format: Literal["pdf"]
+
+
+class BatchPPTXItem(PPTXConversionRequest):
+    """PPTX conversion within a batch"""
+    format: Literal["pptx"]
+
+
+class BatchConversionRequest(BaseModel):
+    """Request model for batch conversion"""
+    requests: List[Annotated[Union[BatchPDFItem, BatchPPTXItem], Field(discriminator="format")]] = Field(
+        ...,
+        description="Conversions to run; each item is a PDF or PPTX request plus its format",
+        min_length=1,
+        max_length=50
+    )
+
+
+def parse_presentation_url(presentation_url: str) -> Tuple[str, str]:
+    """
+    Split a viewer URL into base URL and presentation ID.
+
+    Raises:
+        HTTPException: 400 if the URL has no /p/{id} segment
+    """
+    match = PRESENTATION_URL_RE.match(presentation_url)
+    if not match:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid presentation URL (expected .../p/{{id}}): {presentation_url}"
+        )
+    return match["base"], match["pid"]
+
+
+async def download_response(http_request: Request, content: bytes, media_type: str, filename: str) -> Response:
+    """
+    Build a download response with an ETag over its content.
+
+    The file is sent in one body with a Content-Length; streaming a BytesIO
+    would split the binary into arbitrary line-sized chunks. Returns an empty
+    304 when the client's If-None-Match already holds the same ETag, so
+    repeat downloads transfer no body. The content is hashed in a thread, as
+    decks run to tens of MB.
+    """
+    digest = await asyncio.to_thread(hashlib.blake2b, content, digest_size=16)
+    etag = f'"{digest.hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": DOWNLOAD_CACHE_CONTROL}
+
+    if_none_match = http_request.headers.get("if-none-match", "")
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = CONTENT_DISPOSITION_FMT.format(quote(filename, safe=""))
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
+async def _warm_browser() -> None:
+    """Launch the shared browser and pre-create capture contexts in the background"""
+    try:
+        # One pool per context configuration: screenshot converters render
+        # at 2x and downscale per quality, native PPTX extracts at 1x
+        browser = await BaseConverter.warm_pool(pool_size=4)
+        await NativePPTXConverter.warm_pool(pool_size=2)
+        logger.info("✅ Playwright Chromium ready (version: %s)", browser.version)
+    except Exception as e:
+        # Conversions launch the browser lazily, so this only costs warmth
+        logger.error("❌ Browser warm-up failed: %s", e)
+
+
+_warmup_task: Optional[asyncio.Task] = None
+
+
 # Startup validation
 @app.on_event("startup")
 async def startup_validation():
-    """Validate Playwright browser installation on startup"""
+    """Validate Playwright installation on startup without launching Chromium"""
+    global _warmup_task
+
     logger.info("=" * 60)
     logger.info("🔍 Validating Playwright Browser Installation")
     logger.info("=" * 60)
 
     try:
-        from playwright.async_api import async_playwright
+        version = importlib.metadata.version("playwright")
+        logger.info("✅ Playwright package installed (version: %s)", version)
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            version = browser.version
-            await browser.close()
+        if os.getenv("CHROMIUM_CDP_URL"):
+            logger.info("✅ Using external Chromium over CDP")
+        else:
+            executable = await converter_base.chromium_executable()
+            if executable is None:
+                raise FileNotFoundError("Chromium executable not found")
+            logger.info("✅ Chromium executable: %s", executable)
 
-        logger.info(f"✅ Playwright Chromium ready (version: {version})")
-        logger.info(f"✅ PDF conversion: READY")
-        logger.info(f"✅ PPTX conversion: READY")
+        logger.info("✅ PDF conversion: READY")
+        logger.info("✅ PPTX conversion: READY")
 
     except Exception as e:
-        logger.error(f"❌ Playwright validation failed: {e}")
-        logger.error(f"💡 Run: playwright install --with-deps chromium")
+        logger.error("❌ Playwright validation failed: %s", e)
+        logger.error("💡 Run: playwright install --with-deps chromium")
         raise RuntimeError(f"Playwright not available: {e}")
 
+    # Warm the browser without holding up readiness; the first conversion
+    # waits on the same launch lock if it arrives before warm-up finishes
+    _warmup_task = asyncio.create_task(_warm_browser())
+
     logger.info("=" * 60)
 
 
+@app.on_event("shutdown")
+async def shutdown_resources():
+    """Close the shared Playwright browser and HTTP session"""
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+    await converter_base.shutdown()
+    await BaseConverter.close_http()
+
+
 # Health check
+# The root and health payloads never change, so they are serialized once at
+# import instead of on every request (health checks are polled constantly)
+ROOT_BODY = json.dumps({
+    "service": "v7.5 Download Service",
+    "version": "1.0.0",
+    "status": "operational",
+    "capabilities": ["pdf", "pptx"],
+    "endpoints": {
+        "health": "GET /health",
+        "convert_pdf": "POST /convert/pdf",
+        "convert_pptx": "POST /convert/pptx",
+        "convert_batch": "POST /convert/batch"
+    }
+}, separators=(",", ":")).encode()
+
+HEALTH_BODY = json.dumps({
+    "status": "healthy",
+    "playwright": "ready",
+    "converters": {
+        "pdf": "operational",
+        "pptx": "operational"
+    }
+}, separators=(",", ":")).encode()
+
+
 @app.get("/")
 async def root():
     """API root endpoint"""
-    return {
-        "service": "v7.5 Download Service",
-        "version": "1.0.0",
-        "status": "operational",
-        "capabilities": ["pdf", "pptx"],
-        "endpoints": {
-            "health": "GET /health",
-            "convert_pdf": "POST /convert/pdf",
-            "convert_pptx": "POST /convert/pptx"
-        }
-    }
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "playwright": "ready",
-        "converters": {
-            "pdf": "operational",
-            "pptx": "operational"
-        }
-    }
+    return Response(content=HEALTH_BODY, media_type="application/json")
+
+
+async def render_pdf(request: PDFConversionRequest) -> Tuple[bytes, str]:
+    """Generate a PDF and return its bytes and download filename"""
+    # Extract base URL (everything before /p/) and presentation ID
+    base_url, presentation_id = parse_presentation_url(request.presentation_url)
+
+    logger.info("  Base URL: %s", base_url)
+    logger.info("  Presentation ID: %s", presentation_id)
+    logger.info("  Slide Count: %s", request.slide_count)
+    logger.info("  Quality: %s", request.quality)
+
+    # Initialize converter
+    converter = PDFConverter(base_url=base_url)
+
+    # Generate PDF using screenshot-based approach
+    pdf_bytes = await converter.generate_pdf(
+        presentation_id=presentation_id,
+        slide_count=request.slide_count,
+        quality=request.quality
+    )
+
+    logger.info("✅ PDF generated: %d bytes", len(pdf_bytes))
+    return pdf_bytes, f"presentation-{presentation_id}.pdf"
+
+
+async def render_pptx(request: PPTXConversionRequest) -> Tuple[bytes, str]:
+    """Generate a PPTX and return its bytes and download filename"""
+    # Extract base URL and presentation ID
+    base_url, presentation_id = parse_presentation_url(request.presentation_url)
+
+    logger.info("  Base URL: %s", base_url)
+    logger.info("  Presentation ID: %s", presentation_id)
+    logger.info("  Slide Count: %s", request.slide_count)
+    logger.info("  Quality: %s", request.quality)
+    logger.info("  Variant Requested: '%s'", request.variant)
+
+    # Choose converter based on variant
+    if request.variant == "native":
+        logger.info("Using Native PPTX Converter for %s", presentation_id)
+        converter = NativePPTXConverter(base_url=base_url)
+        pptx_bytes = await converter.generate_pptx(
+            presentation_id=presentation_id,
+            slide_count=request.slide_count,
+            # We need to fetch data inside converter if not passed here
+        )
+    else:
+        logger.info("Using Screenshot PPTX Converter for %s", presentation_id)
+        converter = PPTXConverter(base_url=base_url)
+        pptx_bytes = await converter.generate_pptx(
+            presentation_id=presentation_id,
+            slide_count=request.slide_count,
+            aspect_ratio=request.aspect_ratio,
+            quality=request.quality
+        )
+
+    logger.info("✅ PPTX generated: %d bytes", len(pptx_bytes))
+    return pptx_bytes, f"presentation-{presentation_id}.pptx"
 
 
 # PDF Conversion Endpoint
 @app.post("/convert/pdf")
-async def convert_to_pdf(request: PDFConversionRequest):
+async def convert_to_pdf(request: PDFConversionRequest, http_request: Request):
     """
     Convert presentation to PDF using screenshot-based approach
 
@@ -168,42 +353,21 @@ async def convert_to_pdf(request: PDFConversionRequest):
     The presentation URL should point to a v7.5-main viewer page.
     """
     try:
-        logger.info(f"📄 PDF conversion requested: {request.presentation_url}")
-
-        # Extract presentation ID from URL
-        presentation_id = request.presentation_url.split("/p/")[-1]
-
-        # Extract base URL (everything before /p/)
-        base_url = request.presentation_url.split("/p/")[0]
-
-        logger.info(f"  Base URL: {base_url}")
-        logger.info(f"  Presentation ID: {presentation_id}")
-        logger.info(f"  Slide Count: {request.slide_count}")
-        logger.info(f"  Quality: {request.quality}")
+        logger.info("📄 PDF conversion requested: %s", request.presentation_url)
 
-        # Initialize converter
-        converter = PDFConverter(base_url=base_url)
+        pdf_bytes, filename = await render_pdf(request)
 
-        # Generate PDF using screenshot-based approach
-        pdf_bytes = await converter.generate_pdf(
-            presentation_id=presentation_id,
-            slide_count=request.slide_count,
-            quality=request.quality
-        )
-
-        logger.info(f"✅ PDF generated: {len(pdf_bytes):,} bytes")
-
-        # Return PDF as streaming response
-        return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+        return await download_response(
+            http_request,
+            pdf_bytes,
             media_type="application/pdf",
-            headers={
-                "Content-Disposition": f'attachment; filename="presentation-{presentation_id}.pdf"'
-            }
+            filename=filename
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"❌ PDF conversion failed: {e}", exc_info=True)
+        logger.error("❌ PDF conversion failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"PDF conversion failed: {str(e)}"
@@ -212,7 +376,7 @@ async def convert_to_pdf(request: PDFConversionRequest):
 
 # PPTX Conversion Endpoint
 @app.post("/convert/pptx")
-async def convert_to_pptx(request: PPTXConversionRequest):
+async def convert_to_pptx(request: PPTXConversionRequest, http_request: Request):
     """
     Convert presentation to PPTX
 
@@ -226,71 +390,101 @@ async def convert_to_pptx(request: PPTXConversionRequest):
     The presentation URL should point to a v7.5-main viewer page.
     """
     try:
-        logger.info(f"📊 PPTX conversion requested: {request.presentation_url}")
-
-        # Extract presentation ID from URL
-        presentation_id = request.presentation_url.split("/p/")[-1]
-
-        # Extract base URL
-        base_url = request.presentation_url.split("/p/")[0]
-
-        logger.info(f"  Base URL: {base_url}")
-        logger.info(f"  Presentation ID: {presentation_id}")
-        logger.info(f"  Slide Count: {request.slide_count}")
-        logger.info(f"  Quality: {request.quality}")
-        logger.info(f"  Variant Requested: '{request.variant}'")
-
-        # Choose converter based on variant
-        if request.variant == "native":
-            logger.info(f"Using Native PPTX Converter for {presentation_id}")
-            converter = NativePPTXConverter(base_url=base_url)
-            pptx_bytes = await converter.generate_pptx(
-                presentation_id=presentation_id,
-                slide_count=request.slide_count,
-                # We need to fetch data inside converter if not passed here
-            )
-        else:
-            logger.info(f"Using Screenshot PPTX Converter for {presentation_id}")
-            converter = PPTXConverter(base_url=base_url)
-            pptx_bytes = await converter.generate_pptx(
-                presentation_id=presentation_id,
-                slide_count=request.slide_count,
-                aspect_ratio=request.aspect_ratio,
-                quality=request.quality
-            )
+        logger.info("📊 PPTX conversion requested: %s", request.presentation_url)
 
-        logger.info(f"✅ PPTX generated: {len(pptx_bytes):,} bytes")
+        pptx_bytes, filename = await render_pptx(request)
 
-        # Return PPTX as streaming response
-        return StreamingResponse(
-            io.BytesIO(pptx_bytes),
-            media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-            headers={
-                "Content-Disposition": f'attachment; filename="presentation-{presentation_id}.pptx"'
-            }
+        return await download_response(
+            http_request,
+            pptx_bytes,
+            media_type=PPTX_MEDIA_TYPE,
+            filename=filename
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"❌ PPTX conversion failed: {e}", exc_info=True)
+        logger.error("❌ PPTX conversion failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"PPTX conversion failed: {str(e)}"
         )
 
 
+# Batch Conversion Endpoint
+@app.post("/convert/batch")
+async def convert_batch(batch: BatchConversionRequest):
+    """
+    Convert several presentations in one request
+
+    Items are rendered concurrently, at most BATCH_CONCURRENCY at a time,
+    and returned as a multipart/mixed body with one part per item. Each
+    part's Content-ID is the item's index in the request. A failed item
+    becomes an application/json part with an "error" message instead of
+    failing the whole batch.
+    """
+    logger.info("📦 Batch conversion requested: %s items", len(batch.requests))
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def render(item):
+        async with semaphore:
+            if item.format == "pdf":
+                return (*await render_pdf(item), "application/pdf")
+            return (*await render_pptx(item), PPTX_MEDIA_TYPE)
+
+    results = await asyncio.gather(
+        *(render(item) for item in batch.requests),
+        return_exceptions=True
+    )
+
+    boundary = uuid.uuid4().hex
+    parts = []
+    for index, result in enumerate(results):
+        if isinstance(result, BaseException):
+            detail = result.detail if isinstance(result, HTTPException) else str(result)
+            logger.error("❌ Batch item %s failed: %s", index, detail)
+            headers = "Content-Type: application/json\r\n"
+            body = json.dumps({"error": detail}).encode()
+        else:
+            body, filename, media_type = result
+            headers = (
+                f"Content-Type: {media_type}\r\n"
+                f"Content-Disposition: {CONTENT_DISPOSITION_FMT.format(quote(filename, safe=''))}\r\n"
+            )
+        parts.append(f"--{boundary}\r\nContent-ID: <{index}>\r\n{headers}\r\n".encode() + body + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode())
+
+    failed = sum(isinstance(result, BaseException) for result in results)
+    logger.info("✅ Batch finished: %s succeeded, %s failed", len(results) - failed, failed)
+
+    return Response(
+        content=b"".join(parts),
+        media_type=f"multipart/mixed; boundary={boundary}"
+    )
+
+
 def run_server():
     """Start the download service server"""
     port = int(os.getenv("PORT", "8010"))
 
-    logger.info(f"\n🌐 Starting server on http://0.0.0.0:{port}")
-    logger.info(f"📍 CORS allowed origins: {allowed_origins}")
+    logger.info("\n🌐 Starting server on http://0.0.0.0:%s", port)
+    logger.info("📍 CORS allowed origins: %s", allowed_origins)
     logger.info("=" * 60 + "\n")
 
+    # Each worker process runs its own browser unless CHROMIUM_CDP_URL is set
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    if workers > 1:
+        logger.info("👷 Workers: %s", workers)
+
+    # uvicorn[standard] provides uvloop and httptools; "auto" selects them
     uvicorn.run(
-        app,
+        "server:app",
         host="0.0.0.0",
         port=port,
-        log_level="info"
+        log_level="info",
+        loop="auto",
+        http="auto",
+        workers=workers
     )
 
 
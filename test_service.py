@@ -16,26 +16,35 @@ V75_MAIN_URL = "http://localhost:8504"  # Or use Railway URL
 TEST_PRESENTATION_ID = "test-presentation-id"
 
 
-async def test_health_check():
+async def save_response(response: httpx.Response, path: str) -> int:
+    """Stream a response body to disk in chunks and return its size"""
+    size = 0
+    with open(path, "wb") as f:
+        async for chunk in response.aiter_bytes(chunk_size=1 << 16):
+            f.write(chunk)
+            size += len(chunk)
+    return size
+
+
+async def check_health(client: httpx.AsyncClient):
     """Test health check endpoint"""
     print("\n" + "=" * 60)
     print("TEST 1: Health Check")
     print("=" * 60)
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{DOWNLOAD_SERVICE_URL}/health")
-        print(f"Status: {response.status_code}")
-        print(f"Response: {response.json()}")
+    response = await client.get(f"{DOWNLOAD_SERVICE_URL}/health")
+    print(f"Status: {response.status_code}")
+    print(f"Response: {response.json()}")
 
-        if response.status_code == 200:
-            print("✅ Health check passed")
-            return True
-        else:
-            print("❌ Health check failed")
-            return False
+    if response.status_code == 200:
+        print("✅ Health check passed")
+        return True
+    else:
+        print("❌ Health check failed")
+        return False
 
 
-async def test_pdf_conversion():
+async def check_pdf_conversion(client: httpx.AsyncClient):
     """Test PDF conversion endpoint"""
     print("\n" + "=" * 60)
     print("TEST 2: PDF Conversion")
@@ -44,35 +53,32 @@ async def test_pdf_conversion():
     presentation_url = f"{V75_MAIN_URL}/p/{TEST_PRESENTATION_ID}"
     print(f"Presentation URL: {presentation_url}")
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            f"{DOWNLOAD_SERVICE_URL}/convert/pdf",
-            json={
-                "presentation_url": presentation_url,
-                "landscape": True,
-                "print_background": True,
-                "quality": "high"
-            }
-        )
-
+    async with client.stream(
+        "POST",
+        f"{DOWNLOAD_SERVICE_URL}/convert/pdf",
+        json={
+            "presentation_url": presentation_url,
+            "landscape": True,
+            "print_background": True,
+            "quality": "high"
+        }
+    ) as response:
         print(f"Status: {response.status_code}")
 
         if response.status_code == 200:
-            pdf_size = len(response.content)
+            # Save PDF without holding the whole body in memory
+            pdf_size = await save_response(response, "test_output.pdf")
             print(f"PDF Size: {pdf_size:,} bytes ({pdf_size/1024:.1f} KB)")
 
-            # Save PDF
-            with open("test_output.pdf", "wb") as f:
-                f.write(response.content)
-
             print("✅ PDF saved to test_output.pdf")
             return True
         else:
+            await response.aread()
             print(f"❌ PDF conversion failed: {response.text}")
             return False
 
 
-async def test_pptx_conversion():
+async def check_pptx_conversion(client: httpx.AsyncClient):
     """Test PPTX conversion endpoint"""
     print("\n" + "=" * 60)
     print("TEST 3: PPTX Conversion")
@@ -84,30 +90,27 @@ async def test_pptx_conversion():
     # You need to know the slide count
     slide_count = 7  # Adjust based on your test presentation
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            f"{DOWNLOAD_SERVICE_URL}/convert/pptx",
-            json={
-                "presentation_url": presentation_url,
-                "slide_count": slide_count,
-                "aspect_ratio": "16:9",
-                "quality": "high"
-            }
-        )
-
+    async with client.stream(
+        "POST",
+        f"{DOWNLOAD_SERVICE_URL}/convert/pptx",
+        json={
+            "presentation_url": presentation_url,
+            "slide_count": slide_count,
+            "aspect_ratio": "16:9",
+            "quality": "high"
+        }
+    ) as response:
         print(f"Status: {response.status_code}")
 
         if response.status_code == 200:
-            pptx_size = len(response.content)
+            # Save PPTX without holding the whole body in memory
+            pptx_size = await save_response(response, "test_output.pptx")
             print(f"PPTX Size: {pptx_size:,} bytes ({pptx_size/1024:.1f} KB)")
 
-            # Save PPTX
-            with open("test_output.pptx", "wb") as f:
-                f.write(response.content)
-
             print("✅ PPTX saved to test_output.pptx")
             return True
         else:
+            await response.aread()
             print(f"❌ PPTX conversion failed: {response.text}")
             return False
 
@@ -123,29 +126,31 @@ async def run_tests():
 
     results = []
 
-    # Test 1: Health Check
-    try:
-        result = await test_health_check()
-        results.append(("Health Check", result))
-    except Exception as e:
-        print(f"❌ Health check error: {e}")
-        results.append(("Health Check", False))
-
-    # Test 2: PDF Conversion
-    try:
-        result = await test_pdf_conversion()
-        results.append(("PDF Conversion", result))
-    except Exception as e:
-        print(f"❌ PDF conversion error: {e}")
-        results.append(("PDF Conversion", False))
-
-    # Test 3: PPTX Conversion
-    try:
-        result = await test_pptx_conversion()
-        results.append(("PPTX Conversion", result))
-    except Exception as e:
-        print(f"❌ PPTX conversion error: {e}")
-        results.append(("PPTX Conversion", False))
+    # One client for every test, so connections to the service are reused
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        # Test 1: Health Check
+        try:
+            result = await check_health(client)
+            results.append(("Health Check", result))
+        except Exception as e:
+            print(f"❌ Health check error: {e}")
+            results.append(("Health Check", False))
+
+        # Test 2: PDF Conversion
+        try:
+            result = await check_pdf_conversion(client)
+            results.append(("PDF Conversion", result))
+        except Exception as e:
+            print(f"❌ PDF conversion error: {e}")
+            results.append(("PDF Conversion", False))
+
+        # Test 3: PPTX Conversion
+        try:
+            result = await check_pptx_conversion(client)
+            results.append(("PPTX Conversion", result))
+        except Exception as e:
+            print(f"❌ PPTX conversion error: {e}")
+            results.append(("PPTX Conversion", False))
 
     # Summary
     print("\n" + "=" * 60)